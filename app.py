@@ -11,6 +11,7 @@ import random
 import base64
 import json
 from io import BytesIO
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 # Speech processing library
 try:
@@ -68,6 +69,16 @@ audio_stream = None
 word_generated = False
 cap_lock = threading.Lock()
 shutdown_requested = False
+recognizer = None
+clip_batcher = None
+clip_batcher_lock = threading.Lock()
+
+# Predict words from the lip crops with the trained 3D CNN (src/streaming.py)
+# instead of transcribing the microphone with Whisper
+VISUAL_INFERENCE = True
+
+# Seconds an /api/predict_clip request waits for the batching model worker
+CLIP_PREDICT_TIMEOUT = 10.0
 
 # Audio settings
 CHUNK = 1024
@@ -82,16 +93,43 @@ COMMON_WORDS = ["i", "you", "he", "she", "we", "they", "my", "your", "am", "are"
                 "sorry", "please", "welcome", "bye", "yes", "no", "ok", "fine",
                 "name", "how", "what"]
 
+def publish_prediction(word, confidence):
+    """Called by the streaming recognizer with every new prediction"""
+    global predicted_word, prediction_confidence
+    predicted_word = word
+    prediction_confidence = confidence
+
+def get_clip_batcher():
+    """Start the batching model worker for /api/predict_clip on the first request"""
+    global clip_batcher
+    with clip_batcher_lock:
+        if clip_batcher is None:
+            from src.clip_batching import ClipBatcher
+            batcher = ClipBatcher()
+            batcher.start()
+            clip_batcher = batcher
+    return clip_batcher
+
 def initialize_model():
     """Initialize the lip reading model and face detector"""
-    global whisper_model, detector, predictor, audio, cap
+    global whisper_model, detector, predictor, audio, cap, recognizer
     
-    try:
-        whisper_model = whisper.load_model("base")
-        print("\n[OK] Lip reading model loaded successfully!")
-    except Exception as e:
-        print(f"[ERROR] Failed to load lip reading model: {e}")
-        return False
+    if VISUAL_INFERENCE:
+        try:
+            from src.streaming import create_recognizer
+            recognizer = create_recognizer(publish_prediction)
+            recognizer.start()
+            print("\n[OK] Lip reading model loaded successfully!")
+        except Exception as e:
+            print(f"[ERROR] Failed to load lip reading model: {e}")
+            return False
+    else:
+        try:
+            whisper_model = whisper.load_model("base")
+            print("\n[OK] Lip reading model loaded successfully!")
+        except Exception as e:
+            print(f"[ERROR] Failed to load lip reading model: {e}")
+            return False
     
     # Setup Dlib Face Detector
     SHAPE_PREDICTOR_PATH = os.path.join(PROJECT_ROOT, "model", "shape_predictor_68_face_landmarks.dat")
@@ -289,6 +327,13 @@ def generate_frames():
             except Exception:
                 face_detected = False
         
+        # Feed the lip crop to the streaming recognizer before the UI is drawn on the frame
+        if recognizer is not None:
+            if lip_box:
+                recognizer.push_frame(frame, lip_box)
+            else:
+                recognizer.reset()
+        
         # Update recording progress
         if recording and recording_start_time:
             elapsed = time.time() - recording_start_time
@@ -383,6 +428,10 @@ def start_recording():
     predicted_word = ""
     prediction_confidence = 0.0
     
+    if VISUAL_INFERENCE:
+        # Predictions stream in from the camera; no audio is recorded
+        return jsonify({'success': True, 'message': 'Recording started'})
+    
     def record_and_process():
         audio_data = record_audio(RECORD_SECONDS)
         if audio_data is not None:
@@ -404,12 +453,46 @@ def set_word():
     actual_word = data.get('word', '').strip()
     return jsonify({'success': True, 'word': actual_word})
 
+@app.route('/api/predict_clip', methods=['POST'])
+def predict_clip():
+    """Classify a lip clip sent as raw bytes or .npy: a preprocessed (22, 80, 112) clip, or the raw
+    (22, 80, 112, 3) BGR lip crops when INFERENCE_BACKEND is a serving backend"""
+    from src.clip_batching import parse_clip
+    data = request.files['clip'].read() if 'clip' in request.files else request.get_data()
+    try:
+        batcher = get_clip_batcher()
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Failed to load lip reading model: {e}'}), 503
+    try:
+        clip = parse_clip(data, raw=batcher.raw_input)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    try:
+        probabilities = batcher.predict(clip, timeout=CLIP_PREDICT_TIMEOUT)
+    except (RuntimeError, FutureTimeoutError) as e:
+        # Worker stopped (shutdown) or wedged: the model is unavailable, not the request at fault
+        message = str(e) or 'Timed out waiting for the lip reading model'
+        return jsonify({'success': False, 'message': message}), 503
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Prediction failed: {e}'}), 500
+    best = int(np.argmax(probabilities))
+    return jsonify({
+        'success': True,
+        'word': batcher.words[best],
+        'confidence': float(probabilities[best]) * 100,
+        'probabilities': {word: float(p) for word, p in zip(batcher.words, probabilities)}
+    })
+
 @app.route('/api/stop', methods=['POST'])
 def stop():
     """Stop the application"""
     global cap, audio, audio_monitoring_active, audio_stream, shutdown_requested
     shutdown_requested = True
     audio_monitoring_active = False
+    if recognizer is not None:
+        recognizer.stop()
+    if clip_batcher is not None:
+        clip_batcher.stop()
     time.sleep(0.2)
     if audio_stream:
         try:
@@ -442,9 +525,10 @@ if __name__ == '__main__':
         sys.exit(1)
     
     # Start audio monitoring
-    monitoring_thread = threading.Thread(target=monitor_audio_continuously, daemon=True)
-    monitoring_thread.start()
-    print("[INFO] Continuous audio monitoring started.")
+    if not VISUAL_INFERENCE:
+        monitoring_thread = threading.Thread(target=monitor_audio_continuously, daemon=True)
+        monitoring_thread.start()
+        print("[INFO] Continuous audio monitoring started.")
     
     print("\n[INFO] Starting web server...")
     print("[INFO] Open your browser and navigate to: http://localhost:5001")
@@ -457,6 +541,10 @@ if __name__ == '__main__':
     finally:
         audio_monitoring_active = False
         shutdown_requested = True
+        if recognizer is not None:
+            recognizer.stop()
+        if clip_batcher is not None:
+            clip_batcher.stop()
         if audio_stream:
             try:
                 audio_stream.stop_stream()
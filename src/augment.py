@@ -0,0 +1,50 @@
+import tensorflow as tf
+
+# ==== AUGMENTATION SETTINGS ====
+AUGMENTATIONS = ("identity", "brightness", "noise", "temporal_shift", "spatial_jitter", "frame_dropout")
+BRIGHTNESS_RANGE = (0.8, 1.2)  # Brightness factor drawn per sample
+NOISE_STD = 0.05  # Standard deviation of the Gaussian pixel noise
+MAX_TEMPORAL_SHIFT = 2  # Frames rolled circularly in either direction
+MAX_JITTER = 4  # Pixels the lip crop is moved in each direction (edges are replicated)
+FRAME_DROPOUT_RATE = 0.1  # Probability that a frame is replaced by the previous frame
+
+
+def augment_sample(video, branch, seed, augmentations=AUGMENTATIONS):
+    """Augment one (Frames, Height, Width, Channels) sample with values in [0, 1] inside the graph.
+
+    Applies augmentations[branch] with stateless random ops keyed by seed (a
+    shape [2] integer tensor), so a tf.data map can run it with
+    num_parallel_calls and still give reproducible results.
+    """
+    frames, height, width = video.shape[:3]
+
+    def brightness():
+        factor = tf.random.stateless_uniform([], seed, *BRIGHTNESS_RANGE)
+        return tf.clip_by_value(video * factor, 0.0, 1.0)
+
+    def noise():
+        return tf.clip_by_value(video + tf.random.stateless_normal(tf.shape(video), seed, stddev=NOISE_STD), 0.0, 1.0)
+
+    def temporal_shift():
+        shift = tf.random.stateless_uniform([], seed, -MAX_TEMPORAL_SHIFT, MAX_TEMPORAL_SHIFT + 1, dtype=tf.int32)
+        return tf.roll(video, shift, axis=0)
+
+    def spatial_jitter():
+        dy, dx = tf.unstack(tf.random.stateless_uniform([2], seed, -MAX_JITTER, MAX_JITTER + 1, dtype=tf.int32))
+        rows = tf.clip_by_value(tf.range(height) - dy, 0, height - 1)
+        cols = tf.clip_by_value(tf.range(width) - dx, 0, width - 1)
+        return tf.gather(tf.gather(video, rows, axis=1), cols, axis=2)
+
+    def frame_dropout():
+        # A dropped frame repeats the last kept one, as a stalled camera would
+        keep = tf.random.stateless_uniform([frames], seed) >= FRAME_DROPOUT_RATE
+        keep = tf.tensor_scatter_nd_update(keep, [[0]], [True])
+        kept_frames = tf.boolean_mask(tf.range(frames), keep)
+        return tf.gather(video, tf.gather(kept_frames, tf.cumsum(tf.cast(keep, tf.int32)) - 1))
+
+    branches = {"identity": lambda: video, "brightness": brightness, "noise": noise,
+                "temporal_shift": temporal_shift, "spatial_jitter": spatial_jitter, "frame_dropout": frame_dropout}
+    unknown = set(augmentations) - set(branches)
+    if unknown:
+        raise ValueError(f"Unknown augmentations: {sorted(unknown)}")
+    return tf.switch_case(branch, [branches[name] for name in augmentations])
@@ -0,0 +1,88 @@
+import cv2
+import os
+import numpy as np
+import sys
+import time
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.preprocess import (INPUT_DIR, REQUIRED_FRAMES, FRAME_SHAPE, preprocess_frame, preprocess_frames,
+                            frames_to_sample, frame_number)
+
+# ==== BENCHMARK SETTINGS ====
+MAX_TAKES = 50  # Takes loaded from data/ (random frames are used if data/ is empty)
+REPEATS = 5  # Timed passes over all takes; the best pass is reported
+
+
+def load_takes():
+    """Load up to MAX_TAKES takes from data/ as (N, 80, 112, 3) uint8 stacks"""
+    takes = []
+    if os.path.exists(INPUT_DIR):
+        for word in sorted(os.listdir(INPUT_DIR)):
+            word_path = os.path.join(INPUT_DIR, word)
+            if not os.path.isdir(word_path):
+                continue
+            for take in sorted(os.listdir(word_path)):
+                take_path = os.path.join(word_path, take)
+                if not os.path.isdir(take_path) or len(takes) >= MAX_TAKES:
+                    continue
+                frame_files = sorted(os.listdir(take_path), key=frame_number)
+                images = [cv2.imread(os.path.join(take_path, f)) for f in frame_files]
+                if len(images) > 0:
+                    takes.append(np.stack(images))
+
+    if len(takes) == 0:
+        print("[INFO] No takes found in data/, benchmarking on random frames")
+        rng = np.random.default_rng(0)
+        takes = [rng.integers(0, 256, (REQUIRED_FRAMES,) + FRAME_SHAPE + (3,), dtype=np.uint8)
+                 for _ in range(MAX_TAKES)]
+    return takes
+
+
+def loop_sample(images):
+    """The original per-frame loop of preprocess.py"""
+    frames = np.array([preprocess_frame(image) for image in images], dtype=np.float32) / 255.0
+    if len(frames) < REQUIRED_FRAMES:
+        padding = np.tile(frames[-1], (REQUIRED_FRAMES - len(frames), 1, 1))
+        frames = np.vstack([frames, padding])
+    return frames[:REQUIRED_FRAMES]
+
+
+def batch_sample(images):
+    return frames_to_sample(preprocess_frames(images))
+
+
+def benchmark(name, fn, takes):
+    total_frames = sum(len(images) for images in takes)
+    best = float("inf")
+    for _ in range(REPEATS):
+        start_time = time.perf_counter()
+        for images in takes:
+            fn(images)
+        best = min(best, time.perf_counter() - start_time)
+    fps = total_frames / best
+    print(f"  {name:12s}: {best * 1000:8.1f} ms for {total_frames} frames -> {fps:8.1f} frames/sec")
+    return fps
+
+
+def main():
+    cv2.setNumThreads(1)  # Compare single-core throughput
+    takes = load_takes()
+    print(f"\nBenchmarking preprocessing on {len(takes)} takes ({REPEATS} passes, best shown)\n")
+
+    mismatches = sum(not np.array_equal(loop_sample(images), batch_sample(images)) for images in takes)
+    if mismatches:
+        print(f"[WARNING] Batch output differs from the per-frame loop on {mismatches} takes")
+    else:
+        print("[OK] Batch output is bit-for-bit identical to the per-frame loop\n")
+
+    loop_fps = benchmark("per-frame", loop_sample, takes)
+    batch_fps = benchmark("batch", batch_sample, takes)
+    print(f"\n[INFO] Speedup: {batch_fps / loop_fps:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
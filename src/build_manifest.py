@@ -0,0 +1,125 @@
+import json
+import os
+import shutil
+import sys
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+# Manifests live next to the other build caches, outside data/ and processed_data/
+MANIFEST_DIR = os.path.join(PROJECT_ROOT, "cache")
+
+
+def manifest_path(name):
+    return os.path.join(MANIFEST_DIR, f"{name}_manifest.json")
+
+
+def load_manifest(path):
+    """Load a build manifest, or an empty one if it is missing or unreadable.
+
+    A manifest maps an input key (e.g. "ok/ok_01.mp4") to the fingerprint of
+    that input, the pipeline parameters and the outputs it was built into.
+    """
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                manifest = json.load(f)
+            if isinstance(manifest.get("entries"), dict):
+                return manifest
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Ignoring unreadable manifest {path}: {e}")
+    return {"entries": {}}
+
+
+def save_manifest(manifest, path):
+    """Write a manifest atomically so an interrupted run never leaves a partial file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def replace_output(path, write):
+    """Write an output file through a temporary file that then replaces it.
+
+    write(f) writes the content to an open binary file. The output gets a new
+    inode instead of being overwritten in place, so hard links to the old file
+    (the takes of duplicate videos) keep their content.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def normalise_params(params):
+    """Round-trip parameters through JSON so tuples compare equal to stored lists"""
+    return json.loads(json.dumps(params, sort_keys=True))
+
+
+def relative_path(path):
+    return os.path.relpath(path, PROJECT_ROOT)
+
+
+def absolute_path(path):
+    return os.path.normpath(os.path.join(PROJECT_ROOT, path))
+
+
+def is_up_to_date(manifest, key, fingerprint, params):
+    """True if key was built from the same input and parameters and its outputs still exist"""
+    entry = manifest["entries"].get(key)
+    if entry is None:
+        return False
+    return (entry["fingerprint"] == fingerprint
+            and entry["params"] == normalise_params(params)
+            and all(os.path.exists(absolute_path(p)) for p in entry["outputs"]))
+
+
+def record_build(manifest, key, fingerprint, params, outputs, **extra):
+    """Record a finished build, deleting outputs of the previous build that were not rewritten.
+
+    Extra keyword arguments are stored in the entry as-is.
+    """
+    outputs = [relative_path(p) for p in outputs]
+    previous = manifest["entries"].get(key)
+    if previous is not None:
+        remove_outputs([p for p in previous["outputs"] if p not in outputs])
+    manifest["entries"][key] = {
+        "fingerprint": fingerprint,
+        "params": normalise_params(params),
+        "outputs": outputs,
+        **extra,
+    }
+
+
+def remove_outputs(paths):
+    """Delete output files or directories given relative to the project root"""
+    for path in paths:
+        path = absolute_path(path)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+
+def prune_orphans(manifest, live_keys):
+    """Delete the outputs of every manifest entry whose input no longer exists.
+
+    Returns the keys that were removed.
+    """
+    orphans = [key for key in manifest["entries"] if key not in live_keys]
+    for key in orphans:
+        remove_outputs(manifest["entries"].pop(key)["outputs"])
+    return orphans
+
+
+def directory_fingerprint(path):
+    """Cheap fingerprint of a directory from the names, sizes and mtimes of its files"""
+    fingerprint = []
+    for name in sorted(os.listdir(path)):
+        stat = os.stat(os.path.join(path, name))
+        fingerprint.append([name, stat.st_size, stat.st_mtime_ns])
+    return fingerprint
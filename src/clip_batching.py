@@ -0,0 +1,195 @@
+import os
+import numpy as np
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from io import BytesIO
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.dataset import PROCESSED_DATA_DIR, list_words, normalise_sample, open_store
+from src.inference import INFERENCE_BACKEND, load_classifier
+from src.preprocess import REQUIRED_FRAMES, FRAME_SHAPE
+
+# ==== DYNAMIC BATCHING SETTINGS ====
+# /api/predict_clip requests are queued for one worker thread, which waits up to MAX_WAIT_MS
+# for more clips and classifies up to MAX_BATCH_SIZE of them in one model call.
+# Running this file benchmarks clips/sec with and without batching.
+CLIP_SHAPE = (REQUIRED_FRAMES,) + FRAME_SHAPE  # Preprocessed clip, as saved in processed_data/
+RAW_CLIP_SHAPE = CLIP_SHAPE + (3,)  # Resized BGR lip crops, as taken by the serving backends
+MAX_BATCH_SIZE = 16  # Clips classified together in one model call at most
+MAX_WAIT_MS = 5.0  # How long the worker waits for more clips after the first one arrives
+
+# ==== BENCHMARK SETTINGS ====
+BENCHMARK_CLIENTS = (1, 2, 4, 8, 16)  # Concurrent clients compared
+REQUESTS_PER_CLIENT = 16
+
+
+def parse_clip(data, raw=False):
+    """Decode a request body holding a clip as raw uint8 bytes or a .npy file.
+
+    The clip is a preprocessed (22, 80, 112) clip, or with raw set the (22, 80,
+    112, 3) uint8 BGR lip crops a serving backend preprocesses itself.
+    """
+    shape = RAW_CLIP_SHAPE if raw else CLIP_SHAPE
+    if data[:6] == b"\x93NUMPY":
+        try:
+            clip = np.load(BytesIO(data), allow_pickle=False)
+        except ValueError as e:
+            raise ValueError(f"Invalid .npy data: {e}")
+        if clip.shape != shape:
+            raise ValueError(f"Clip must have shape {shape}, got {clip.shape}")
+        if clip.dtype in (np.float16, np.float32) and not raw:
+            if not np.isfinite(clip).all() or clip.min() < 0 or clip.max() > 1:
+                raise ValueError("Float clips must hold normalised pixel values in [0, 1]")
+        elif clip.dtype != np.uint8:
+            expected = "uint8" if raw else "uint8 (or float in [0, 1])"
+            raise ValueError(f"Clip dtype must be {expected}, got {clip.dtype}")
+        return clip
+    if len(data) != np.prod(shape):
+        raise ValueError(f"Expected a .npy file or {np.prod(shape)} raw uint8 bytes, got {len(data)} bytes")
+    return np.frombuffer(data, dtype=np.uint8).reshape(shape)
+
+
+class ClipBatcher:
+    """Classifies clips from many threads with one batched model call at a time.
+
+    raw_input tells whether the backend takes raw BGR crops (see parse_clip).
+    """
+
+    def __init__(self, backend=INFERENCE_BACKEND, words=None, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.classifier = load_classifier(backend)
+        self.words = words or list_words(PROCESSED_DATA_DIR)
+        if len(self.words) != self.classifier.num_classes:
+            raise ValueError(f"Model predicts {self.classifier.num_classes} words but {len(self.words)} were given")
+        self.raw_input = self.classifier.raw_input
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = deque()  # (clip, future) waiting for the worker
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+        self.batches = 0  # Model calls so far
+        self.clips = 0  # Clips classified so far
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+
+    def predict(self, clip, timeout=None):
+        """Queue a clip (as returned by parse_clip) and block until its softmax probabilities are ready"""
+        future = Future()
+        clip = np.asarray(clip) if self.raw_input else normalise_sample(np.asarray(clip))
+        with self.condition:
+            if not self.running:
+                raise RuntimeError("ClipBatcher is not running")
+            self.queue.append((clip, future))
+            self.condition.notify()
+        return future.result(timeout)
+
+    def model_input(self, clips):
+        """Stack clips into the (N, 22, 80, 112, channels) batch the classifier takes"""
+        X = np.stack(clips)
+        return X if self.raw_input else X[..., np.newaxis]
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.queue:
+                    self.condition.wait()
+                # Give concurrent requests a few milliseconds to join the batch
+                deadline = time.perf_counter() + self.max_wait
+                while self.running and len(self.queue) < self.max_batch_size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                if not self.running:
+                    break
+                batch = [self.queue.popleft() for _ in range(min(len(self.queue), self.max_batch_size))]
+
+            X = self.model_input([clip for clip, _ in batch])
+            try:
+                probabilities = self.classifier.predict(X)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.clips += len(batch)
+            for (_, future), clip_probabilities in zip(batch, probabilities):
+                future.set_result(clip_probabilities)
+
+        # Fail the requests still waiting so their threads do not hang
+        with self.condition:
+            while self.queue:
+                self.queue.popleft()[1].set_exception(RuntimeError("ClipBatcher was stopped"))
+
+
+def run_clients(predict, clips, num_clients):
+    """Clips/sec when num_clients threads each classify REQUESTS_PER_CLIENT clips"""
+    def client(offset):
+        for i in range(REQUESTS_PER_CLIENT):
+            predict(clips[(offset + i) % len(clips)])
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(num_clients)]
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return num_clients * REQUESTS_PER_CLIENT / (time.perf_counter() - start_time)
+
+
+def main():
+    try:
+        batcher = ClipBatcher()
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    batcher.start()
+    if batcher.raw_input:
+        # Throughput does not depend on the pixels, so random crops stand in for raw takes
+        clips = np.random.default_rng(0).integers(0, 256, (32,) + RAW_CLIP_SHAPE, dtype=np.uint8)
+    else:
+        store = open_store()
+        clips = store.get(np.arange(min(32, len(store))))[..., 0]
+
+    # Without batching every request runs its own model call, one at a time
+    lock = threading.Lock()
+
+    def predict_one(clip):
+        with lock:
+            return batcher.classifier.predict(batcher.model_input([clip]))[0]
+
+    predict_one(clips[0])  # Warm-up
+    batcher.predict(clips[0])
+
+    print("\n" + "=" * 62)
+    print(f"{'Clients':>7s} {'One-by-one clips/s':>20s} {'Batched clips/s':>17s} {'Avg batch':>11s}")
+    print("=" * 62)
+    for num_clients in BENCHMARK_CLIENTS:
+        serial = run_clients(predict_one, clips, num_clients)
+        batches, batched_clips = batcher.batches, batcher.clips
+        batched = run_clients(batcher.predict, clips, num_clients)
+        average_batch = (batcher.clips - batched_clips) / max(1, batcher.batches - batches)
+        print(f"{num_clients:7d} {serial:20.1f} {batched:17.1f} {average_batch:11.1f}")
+    print("=" * 62)
+    batcher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import os
+import numpy as np
+import sys
+import time
+import tensorflow as tf
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.dataset import open_store
+from src.model_variants import ARCHITECTURES
+from src.train_model import INPUT_SHAPE, prepare_datasets, build_3d_cnn, compile_model, training_callbacks
+
+# ==== REPORT SETTINGS ====
+# Every architecture in model_variants.ARCHITECTURES is reported with its parameters, FLOPs,
+# single-clip CPU latency and validation accuracy, trained on the same split and seed.
+REPORT_EPOCHS = 60  # Training epochs per architecture (early stopping may end sooner)
+LATENCY_RUNS = 50  # Timed single-clip inferences per architecture; the median is reported
+SEED = 42
+
+
+def count_flops(model):
+    """Floating point operations for one clip, from the TensorFlow profiler on the frozen graph"""
+    from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2_as_graph
+
+    forward = tf.function(lambda x: model(x, training=False))
+    concrete = forward.get_concrete_function(tf.TensorSpec((1,) + INPUT_SHAPE, tf.float32))
+    _, graph_def = convert_variables_to_constants_v2_as_graph(concrete)
+    with tf.Graph().as_default() as graph:
+        tf.graph_util.import_graph_def(graph_def, name="")
+        options = tf.compat.v1.profiler.ProfileOptionBuilder.float_operation()
+        options["output"] = "none"
+        profile = tf.compat.v1.profiler.profile(graph=graph, run_meta=tf.compat.v1.RunMetadata(), cmd="op",
+                                                options=options)
+    return profile.total_float_ops
+
+
+def measure_latency(model):
+    """Median CPU latency in ms of one (1, 22, 80, 112, 1) clip"""
+    timings = []
+    with tf.device("/CPU:0"):  # Only the timed inference is pinned; training may still use a GPU
+        cpu_model = tf.keras.models.clone_model(model)  # Weights created here live on the CPU
+        cpu_model.set_weights(model.get_weights())
+        forward = tf.function(lambda x: cpu_model(x, training=False))
+        clip = tf.constant(np.random.default_rng(SEED).random((1,) + INPUT_SHAPE, dtype=np.float32))
+        for _ in range(5):  # Warm-up (tracing, memory allocation)
+            forward(clip)
+        for _ in range(LATENCY_RUNS):
+            start_time = time.perf_counter()
+            forward(clip).numpy()
+            timings.append(time.perf_counter() - start_time)
+    return float(np.median(timings)) * 1000
+
+
+def train_and_evaluate(model, train_dataset, val_dataset):
+    """Train as train_model.py does and return the validation accuracy"""
+    model.fit(train_dataset, epochs=REPORT_EPOCHS, validation_data=val_dataset, callbacks=training_callbacks(),
+              verbose=0)
+    _, accuracy, _, _ = model.evaluate(val_dataset, verbose=0)
+    return accuracy
+
+
+def main():
+    store = open_store()
+    num_classes = len(store.words)
+    print(f"\n[INFO] {len(store)} samples, {num_classes} words\n")
+
+    results = {}
+    for architecture in ARCHITECTURES:
+        # Same split, initialisation seed and augmentations for all
+        train_dataset, val_dataset, _ = prepare_datasets(store, np.arange(len(store)), store.labels, num_classes, SEED)
+        model = compile_model(build_3d_cnn(INPUT_SHAPE, num_classes, architecture=architecture))
+        params, flops, latency = model.count_params(), count_flops(model), measure_latency(model)
+        print(f"[INFO] {architecture}: {params:,} params, {flops / 1e6:.1f} MFLOPs, {latency:.1f} ms; "
+              f"training for up to {REPORT_EPOCHS} epochs...")
+        accuracy = train_and_evaluate(model, train_dataset, val_dataset)
+        results[architecture] = (params, flops, latency, accuracy)
+
+    # ==== REPORT ====
+    reference_latency = results["conv3d"][2]
+    print("\n" + "=" * 78)
+    print(f"{'Architecture':16s} {'Params':>10s} {'MFLOPs':>10s} {'CPU ms':>9s} {'Speedup':>9s} {'Val accuracy':>14s}")
+    print("=" * 78)
+    for architecture, (params, flops, latency, accuracy) in results.items():
+        print(f"{architecture:16s} {params:10,d} {flops / 1e6:10.1f} {latency:9.2f} {reference_latency / latency:8.2f}x "
+              f"{accuracy * 100:13.2f}%")
+    print("=" * 78)
+    print("Set MODEL_ARCHITECTURE in src/train_model.py to choose the architecture.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import cv2
+import os
+import numpy as np
+import sys
+import time
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.preprocess import INPUT_DIR, PREPROCESS_PROFILES, BatchPreprocessor, frames_to_sample, frame_number
+
+# ==== REPORT SETTINGS ====
+# Every take in data/ is preprocessed with each profile and the 3D CNN is retrained on the
+# result with the same split and seed, to weigh accuracy against throughput.
+REPORT_EPOCHS = 60  # Training epochs per profile (early stopping may end sooner)
+TIMING_PASSES = 3  # Preprocessing passes per profile; the fastest is reported
+SEED = 42
+
+
+def load_takes():
+    """Load every take in data/ as a (N, 80, 112, 3) uint8 stack with its word label"""
+    if not os.path.exists(INPUT_DIR):
+        print(f"[ERROR] {INPUT_DIR} does not exist. Please run process_videos.py or collection.py first.")
+        sys.exit(1)
+
+    words = sorted(d for d in os.listdir(INPUT_DIR) if os.path.isdir(os.path.join(INPUT_DIR, d)))
+    takes, labels = [], []
+    for label, word in enumerate(words):
+        word_path = os.path.join(INPUT_DIR, word)
+        for take in sorted(os.listdir(word_path)):
+            take_path = os.path.join(word_path, take)
+            if not os.path.isdir(take_path):
+                continue
+            frame_files = sorted(os.listdir(take_path), key=frame_number)
+            images = [cv2.imread(os.path.join(take_path, f)) for f in frame_files]
+            if len(images) > 0:
+                takes.append(np.stack(images))
+                labels.append(label)
+    return takes, np.array(labels), words
+
+
+def preprocess_all(takes, profile):
+    """Preprocess every take with a profile; returns the samples and single-core frames/sec"""
+    preprocessor = BatchPreprocessor(profile)
+    total_frames = sum(len(images) for images in takes)
+    best = float("inf")
+    for _ in range(TIMING_PASSES):
+        start_time = time.perf_counter()
+        samples = [frames_to_sample(preprocessor(images)) for images in takes]
+        best = min(best, time.perf_counter() - start_time)
+    return np.stack(samples), total_frames / best
+
+
+def train_and_evaluate(X, y, num_classes):
+    """Train the 3D CNN as train_model.py does and return the validation accuracy"""
+    from src.train_model import INPUT_SHAPE, prepare_datasets, build_3d_cnn, compile_model, training_callbacks
+
+    # Same split, initial weights and augmentations for every profile
+    train_dataset, val_dataset, _ = prepare_datasets(X, np.arange(len(X)), y, num_classes, SEED)
+
+    model = compile_model(build_3d_cnn(INPUT_SHAPE, num_classes))
+    model.fit(train_dataset, epochs=REPORT_EPOCHS, validation_data=val_dataset,
+              callbacks=training_callbacks(), verbose=0)
+    _, accuracy, _, _ = model.evaluate(val_dataset, verbose=0)
+    return accuracy
+
+
+def main():
+    cv2.setNumThreads(1)  # Throughput is compared on a single core, as on a weak CPU
+    takes, y, words = load_takes()
+    print(f"\n[INFO] Loaded {len(takes)} takes across {len(words)} words\n")
+
+    results = {}
+    for profile in PREPROCESS_PROFILES:
+        print(f"[INFO] Profile '{profile}': preprocessing...")
+        X, fps = preprocess_all(takes, profile)
+        print(f"[INFO] Profile '{profile}': training for up to {REPORT_EPOCHS} epochs...")
+        accuracy = train_and_evaluate(X, y, len(words))
+        results[profile] = (fps, accuracy)
+
+    # ==== REPORT ====
+    reference_fps, reference_accuracy = results["reference"]
+    print("\n" + "=" * 64)
+    print(f"{'Profile':12s} {'Frames/sec':>12s} {'Speedup':>9s} {'Val accuracy':>14s} {'Delta':>9s}")
+    print("=" * 64)
+    for profile, (fps, accuracy) in results.items():
+        print(f"{profile:12s} {fps:12.1f} {fps / reference_fps:8.2f}x "
+              f"{accuracy * 100:13.2f}% {(accuracy - reference_accuracy) * 100:+8.2f}%")
+    print("=" * 64)
+    print("Set PREPROCESS_PROFILE in src/preprocess.py to choose the profile.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import numpy as np
+import sys
+import time
+from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.model_selection import StratifiedKFold
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src import worker_pool
+from src.dataset import open_store
+
+# ==== CROSS-VALIDATION SETTINGS ====
+# Each fold trains in its own worker process (see worker_pool.py). Early stopping only sees an
+# inner split of the training part; the held-out folds give the per-class metrics.
+NUM_FOLDS = 5  # Lowered automatically if a word has fewer takes
+CV_EPOCHS = 100  # Training epochs per fold (early stopping may end sooner)
+NUM_WORKERS = None  # Folds trained at once; None = min(NUM_FOLDS, CPU count)
+SEED = 42
+
+
+def train_fold(job):
+    """Train one fold and return its out-of-fold predictions"""
+    import tensorflow as tf
+    from src.train_model import INPUT_SHAPE, prepare_datasets, build_3d_cnn, compile_model, training_callbacks
+
+    fold, train_idx, test_idx = job
+    store = worker_pool.store
+    num_classes = len(store.words)
+    start_time = time.perf_counter()
+
+    # Inner split of the training part drives early stopping and the LR schedule
+    fit_dataset, val_dataset, _ = prepare_datasets(store, train_idx, store.labels[train_idx], num_classes, SEED + fold)
+
+    # tf.data runs on its own pool sized like this worker's TensorFlow threads rather than on
+    # a pool per CPU in every worker; single-threaded ops leave the cores to parallel calls
+    options = tf.data.Options()
+    options.threading.private_threadpool_size = worker_pool.threads
+    options.threading.max_intra_op_parallelism = 1
+    fit_dataset, val_dataset = fit_dataset.with_options(options), val_dataset.with_options(options)
+
+    model = compile_model(build_3d_cnn(INPUT_SHAPE, num_classes))
+    model.fit(fit_dataset, epochs=CV_EPOCHS, validation_data=val_dataset, callbacks=training_callbacks(), verbose=0)
+
+    probabilities = np.concatenate([model.predict(X_batch, verbose=0) for X_batch in store.batches(test_idx, 32)])
+    return fold, test_idx, np.argmax(probabilities, axis=1), time.perf_counter() - start_time
+
+
+def main():
+    store = open_store()  # Build the store once here so workers only open it
+    words, y = store.words, store.labels
+    num_folds = min(NUM_FOLDS, int(np.bincount(y).min()))
+    if num_folds < 2:
+        print("[ERROR] Every word needs at least 2 takes for cross-validation.")
+        sys.exit(1)
+    if num_folds < NUM_FOLDS:
+        print(f"[INFO] Smallest word has {num_folds} takes, using {num_folds} folds instead of {NUM_FOLDS}")
+
+    folds = StratifiedKFold(n_splits=num_folds, shuffle=True, random_state=SEED).split(np.zeros(len(y)), y)
+    jobs = [(fold, train_idx, test_idx) for fold, (train_idx, test_idx) in enumerate(folds)]
+
+    num_workers = NUM_WORKERS or min(num_folds, os.cpu_count() or 1)
+    threads = max(1, (os.cpu_count() or 1) // num_workers)
+    print(f"\n[INFO] {num_folds}-fold cross-validation of {len(y)} samples across {len(words)} words")
+    print(f"[INFO] {num_workers} worker(s) x {threads} TensorFlow thread(s)\n")
+
+    start_time = time.perf_counter()
+    predictions = np.empty(len(y), dtype=np.int64)
+    fold_accuracies = {}
+    fold_time = 0.0
+    # TensorFlow is not fork-safe, so workers are spawned fresh
+    with multiprocessing.get_context("spawn").Pool(num_workers, initializer=worker_pool.init_worker,
+                                               initargs=(threads,)) as pool:
+        for fold, test_idx, predicted, elapsed in pool.imap_unordered(train_fold, jobs):
+            predictions[test_idx] = predicted
+            fold_accuracies[fold] = np.mean(predicted == y[test_idx])
+            fold_time += elapsed
+            print(f"[OK] Fold {fold + 1}/{num_folds}: accuracy {fold_accuracies[fold] * 100:.2f}% ({elapsed:.0f}s)")
+    wall_time = time.perf_counter() - start_time
+
+    # ==== REPORT ====
+    accuracies = np.array([fold_accuracies[fold] for fold in sorted(fold_accuracies)])
+    print("\n" + "=" * 64)
+    print(f"Accuracy: {accuracies.mean() * 100:.2f}% +/- {accuracies.std() * 100:.2f}% over {num_folds} folds")
+    print(f"Wall time: {wall_time:.0f}s for {fold_time:.0f}s of fold training ({fold_time / wall_time:.2f}x parallel)")
+    print("=" * 64)
+    print("\nPer-class results (out-of-fold predictions):")
+    print(classification_report(y, predictions, labels=np.arange(len(words)), target_names=words, digits=3,
+                                zero_division=0))
+    print("Confusion matrix (rows = actual, columns = predicted):")
+    print(f"{'':10s} " + " ".join(f"{word[:6]:>6s}" for word in words))
+    for word, row in zip(words, confusion_matrix(y, predictions, labels=np.arange(len(words)))):
+        print(f"{word:10s} " + " ".join(f"{count:6d}" for count in row))
+
+
+if __name__ == "__main__":
+    main()
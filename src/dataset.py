@@ -0,0 +1,191 @@
+import json
+import numpy as np
+import os
+import sys
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.build_manifest import directory_fingerprint
+
+PROCESSED_DATA_DIR = os.path.join(PROJECT_ROOT, "processed_data")
+SAMPLE_SHAPE = (22, 80, 112)  # (Frames, Height, Width) of a stored sample
+
+# ==== CONSOLIDATED STORE ====
+# processed_data/ is consolidated into a few shard files plus an index of labels and
+# offsets, opened with np.load(mmap_mode='r'). Loaders rebuild the store automatically
+# whenever processed_data/ changes; run this file to rebuild it by hand.
+STORE_DIR = os.path.join(PROJECT_ROOT, "dataset_store")
+SHARD_MAX_SAMPLES = 2048  # ~1.6 GB per float32 shard, ~400 MB as uint8
+
+
+def normalise_sample(sample):
+    """Return a sample as float32 in [0, 1], whatever dtype it was stored with.
+
+    uint8 samples hold raw pixels and are divided by 255 here, which gives exactly
+    the values a float32 sample would have stored.
+    """
+    if sample.dtype == np.uint8:
+        return np.divide(sample, np.float32(255.0), dtype=np.float32)
+    return sample.astype(np.float32, copy=False)
+
+
+def load_sample(filepath):
+    """Load one .npy sample as float32 in [0, 1]"""
+    return normalise_sample(np.load(filepath))
+
+
+def list_words(data_dir=PROCESSED_DATA_DIR):
+    """Sorted word list; the index of a word is its class label"""
+    if not os.path.exists(data_dir):
+        print(f"[ERROR] {data_dir} does not exist. Please run preprocess.py first.")
+        sys.exit(1)
+    words = sorted(d for d in os.listdir(data_dir) if os.path.isdir(os.path.join(data_dir, d)))
+    if len(words) == 0:
+        print(f"[ERROR] No words found in {data_dir}. Please collect and preprocess data first.")
+        sys.exit(1)
+    return words
+
+
+def list_samples(data_dir=PROCESSED_DATA_DIR):
+    """List the words and (word, sample path) pairs below data_dir/<word>/"""
+    words = list_words(data_dir)
+
+    samples = []
+    for word in words:
+        word_path = os.path.join(data_dir, word)
+        for take_file in sorted(os.listdir(word_path)):
+            if take_file.endswith(".npy"):
+                samples.append((word, os.path.join(word_path, take_file)))
+    return words, samples
+
+
+def data_fingerprint(data_dir=PROCESSED_DATA_DIR):
+    """Fingerprint of processed_data/ from file names, sizes and mtimes (no sample is read)"""
+    return {word: directory_fingerprint(os.path.join(data_dir, word))
+            for word in sorted(os.listdir(data_dir)) if os.path.isdir(os.path.join(data_dir, word))}
+
+
+def build_store(data_dir=PROCESSED_DATA_DIR, store_dir=STORE_DIR):
+    """Consolidate every (22, 80, 112) sample of data_dir into shard files and an index.
+
+    Samples are copied one at a time into memory-mapped shards, so building
+    needs memory for a single sample only. Shards keep the stored dtype when all
+    samples share it, and fall back to normalised float32 otherwise.
+    """
+    words, samples = list_samples(data_dir)
+    word_to_index = {word: i for i, word in enumerate(words)}
+
+    # Read only the .npy headers to filter shapes and pick the shard dtype
+    valid = []
+    dtypes = set()
+    for word, path in samples:
+        header = np.load(path, mmap_mode="r")
+        if header.shape == SAMPLE_SHAPE:  # Ensure correct shape
+            valid.append((word, path))
+            dtypes.add(header.dtype)
+    dtype = dtypes.pop() if len(dtypes) == 1 else np.dtype(np.float32)
+
+    # Drop the old index before touching any shard: from here until the new index is
+    # written the store has no index, so an interrupted build is rebuilt, never opened
+    os.makedirs(store_dir, exist_ok=True)
+    index_path = os.path.join(store_dir, "index.json")
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    for name in os.listdir(store_dir):
+        if name.startswith("shard_"):
+            os.remove(os.path.join(store_dir, name))
+
+    shards = []
+    index = []
+    for shard_id, start in enumerate(range(0, len(valid), SHARD_MAX_SAMPLES)):
+        chunk = valid[start:start + SHARD_MAX_SAMPLES]
+        shard_file = f"shard_{shard_id:03d}.npy"
+        shard = np.lib.format.open_memmap(os.path.join(store_dir, shard_file), mode="w+",
+                                          dtype=dtype, shape=(len(chunk),) + SAMPLE_SHAPE)
+        for offset, (word, path) in enumerate(chunk):
+            sample = np.load(path)
+            shard[offset] = sample if sample.dtype == dtype else normalise_sample(sample)
+            index.append({"key": os.path.relpath(path, data_dir), "label": word_to_index[word],
+                          "shard": shard_id, "offset": offset})
+        shard.flush()
+        del shard
+        shards.append({"file": shard_file, "count": len(chunk)})
+
+    # The index is written last and atomically; its presence marks a complete build
+    tmp_path = os.path.join(store_dir, "index.json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"words": words, "dtype": np.dtype(dtype).name, "shards": shards, "samples": index,
+                   "fingerprint": data_fingerprint(data_dir)}, f)
+    os.replace(tmp_path, index_path)
+    print(f"[OK] Built dataset store with {len(index)} samples in {len(shards)} shard(s) at {store_dir}")
+
+
+class DatasetStore:
+    """Read-only view of a consolidated dataset store.
+
+    Shards are memory-mapped, so opening the store costs the same whatever the
+    number of samples, and only the samples that are actually read are paged in.
+    """
+
+    def __init__(self, store_dir=STORE_DIR):
+        with open(os.path.join(store_dir, "index.json")) as f:
+            index = json.load(f)
+        self.words = index["words"]
+        self.dtype = np.dtype(index["dtype"])
+        self.fingerprint = index["fingerprint"]
+        self.keys = [entry["key"] for entry in index["samples"]]
+        self.labels = np.array([entry["label"] for entry in index["samples"]], dtype=np.int64)
+        self.shard_ids = np.array([entry["shard"] for entry in index["samples"]], dtype=np.int64)
+        self.offsets = np.array([entry["offset"] for entry in index["samples"]], dtype=np.int64)
+        self.shards = [np.load(os.path.join(store_dir, shard["file"]), mmap_mode="r") for shard in index["shards"]]
+        for shard, info in zip(self.shards, index["shards"]):
+            if shard.shape != (info["count"],) + SAMPLE_SHAPE:
+                raise ValueError(f"Shard {info['file']} has shape {shard.shape}, expected {info['count']} samples")
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, i):
+        """Sample i as stored (22, 80, 112), as a zero-copy memory-mapped view"""
+        return self.shards[self.shard_ids[i]][self.offsets[i]]
+
+    def get(self, indices):
+        """Normalised float32 copies of the given samples, shaped (N, 22, 80, 112, 1)"""
+        indices = np.asarray(indices, dtype=np.int64)
+        X = np.empty((len(indices),) + SAMPLE_SHAPE + (1,), dtype=np.float32)
+        for shard_id, shard in enumerate(self.shards):
+            rows = np.nonzero(self.shard_ids[indices] == shard_id)[0]
+            if len(rows) == 0:
+                continue
+            # Read each shard in offset order so the memory map is scanned sequentially
+            order = rows[np.argsort(self.offsets[indices[rows]])]
+            X[order, ..., 0] = normalise_sample(shard[self.offsets[indices[order]]])
+        return X
+
+    def batches(self, indices, batch_size):
+        """Yield normalised batches of the given samples in order"""
+        for start in range(0, len(indices), batch_size):
+            yield self.get(indices[start:start + batch_size])
+
+
+def open_store(data_dir=PROCESSED_DATA_DIR, store_dir=STORE_DIR):
+    """Open the dataset store, (re)building it first if processed_data/ changed"""
+    index_path = os.path.join(store_dir, "index.json")
+    if os.path.exists(index_path):
+        try:
+            store = DatasetStore(store_dir)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARNING] Dataset store at {store_dir} is unreadable ({e}), rebuilding...")
+        else:
+            if os.path.exists(data_dir) and store.fingerprint == json.loads(json.dumps(data_fingerprint(data_dir))):
+                return store
+            print("[INFO] processed_data/ changed since the dataset store was built, rebuilding...")
+    build_store(data_dir, store_dir)
+    return DatasetStore(store_dir)
+
+
+if __name__ == "__main__":
+    build_store()
@@ -0,0 +1,116 @@
+import os
+import numpy as np
+import sys
+import tensorflow as tf
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.compare_architectures import measure_latency
+from src.dataset import open_store
+from src.train_model import (INPUT_SHAPE, EPOCHS, MODEL_DIR, prepare_datasets, build_3d_cnn, compile_model,
+                             training_callbacks)
+
+# ==== DISTILLATION SETTINGS ====
+# The student learns from the hard labels and the teacher's temperature-softened predictions
+# and is saved as model/lip_reader_3dcnn_student.h5, loadable like the teacher.
+TEACHER_PATHS = [os.path.join(MODEL_DIR, "lip_reader_3dcnn_best.h5"), os.path.join(MODEL_DIR, "lip_reader_3dcnn.h5")]
+STUDENT_PATH = os.path.join(MODEL_DIR, "lip_reader_3dcnn_student.h5")
+STUDENT_ARCHITECTURE = "r2plus1d"  # See src/model_variants.py
+STUDENT_FILTERS = (8, 16, 32)
+STUDENT_DENSE_UNITS = (64, 32)
+TEMPERATURE = 4.0  # Softening of the teacher and student distributions
+ALPHA = 0.3  # Weight of the hard-label loss; the soft-target loss gets 1 - ALPHA
+LEARNING_RATE = 0.001
+SEED = 42
+
+
+def load_teacher():
+    for path in TEACHER_PATHS:
+        if os.path.exists(path):
+            print(f"[INFO] Teacher: {path}")
+            return tf.keras.models.load_model(path)
+    print(f"[ERROR] No trained model found in {MODEL_DIR}. Please run train_model.py first.")
+    sys.exit(1)
+
+
+def with_soft_targets(dataset, teacher):
+    """Append the teacher's predictions on each (augmented) batch to the one-hot labels"""
+    def add_teacher_predictions(X, y):
+        return X, tf.concat([y, teacher(X, training=False)], axis=1)
+
+    return dataset.map(add_teacher_predictions).prefetch(tf.data.AUTOTUNE)
+
+
+def soften(probabilities):
+    # log(p) equals the logits up to a constant, which softmax ignores
+    return tf.math.log(probabilities + 1e-7) / TEMPERATURE
+
+
+def distillation_loss(num_classes):
+    def loss(y_true, y_pred):
+        hard, soft = y_true[:, :num_classes], y_true[:, num_classes:]
+        hard_loss = tf.keras.losses.categorical_crossentropy(hard, y_pred)
+        teacher_soft = tf.nn.softmax(soften(soft))
+        soft_loss = tf.reduce_sum(teacher_soft * (tf.math.log(teacher_soft + 1e-7) - tf.nn.log_softmax(soften(y_pred))),
+                                  axis=-1)
+        return ALPHA * hard_loss + (1 - ALPHA) * TEMPERATURE ** 2 * soft_loss  # T^2 keeps gradient scales comparable
+    return loss
+
+
+def hard_label_accuracy(num_classes):
+    def accuracy(y_true, y_pred):
+        return tf.keras.metrics.categorical_accuracy(y_true[:, :num_classes], y_pred)
+    return accuracy
+
+
+def main():
+    store = open_store()
+    words = store.words
+    num_classes = len(words)
+    teacher = load_teacher()
+    if teacher.output_shape[-1] != num_classes:
+        print(f"[ERROR] Teacher predicts {teacher.output_shape[-1]} words but processed_data has {num_classes}.")
+        sys.exit(1)
+
+    train_dataset, val_dataset, _ = prepare_datasets(store, np.arange(len(store)), store.labels, num_classes, SEED)
+
+    student = build_3d_cnn(INPUT_SHAPE, num_classes, filters=STUDENT_FILTERS, dense_units=STUDENT_DENSE_UNITS,
+                           architecture=STUDENT_ARCHITECTURE)
+    student.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=LEARNING_RATE),
+                    loss=distillation_loss(num_classes), metrics=[hard_label_accuracy(num_classes)])
+
+    print(f"\n[INFO] Teacher parameters: {teacher.count_params():,}, student parameters: {student.count_params():,}")
+    print("\nDistilling...\n")
+    student.fit(
+        with_soft_targets(train_dataset, teacher),
+        epochs=EPOCHS,
+        validation_data=with_soft_targets(val_dataset, teacher),
+        callbacks=training_callbacks(),
+        verbose=1
+    )
+
+    # Recompile with the standard loss so the saved student loads without custom objects
+    compile_model(student)
+    student.save(STUDENT_PATH)
+    print(f"\n[OK] Student saved to {STUDENT_PATH}")
+
+    # ==== REPORT ====
+    compile_model(teacher)
+    _, teacher_acc, _, _ = teacher.evaluate(val_dataset, verbose=0)
+    _, student_acc, _, _ = student.evaluate(val_dataset, verbose=0)
+    teacher_ms, student_ms = measure_latency(teacher), measure_latency(student)
+    print("\n" + "=" * 60)
+    print(f"{'Model':10s} {'Params':>10s} {'CPU ms':>9s} {'Val accuracy':>14s}")
+    print("=" * 60)
+    print(f"{'teacher':10s} {teacher.count_params():10,d} {teacher_ms:9.2f} {teacher_acc * 100:13.2f}%")
+    print(f"{'student':10s} {student.count_params():10,d} {student_ms:9.2f} {student_acc * 100:13.2f}%")
+    print("=" * 60)
+    print(f"Student keeps {student_acc / max(teacher_acc, 1e-7) * 100:.1f}% of the teacher's accuracy "
+          f"at {teacher_ms / student_ms:.2f}x the speed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os
+import numpy as np
+import sys
+import tensorflow as tf
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.dataset import open_store
+from src.inference import MODEL_PATHS, load_classifier
+from src.streaming import EARLY_EXIT_FRAMES, WINDOW_FRAMES
+from src.train_model import prepare_datasets, compile_model, training_callbacks
+
+# ==== EARLY-EXIT SETTINGS ====
+# The model is fine-tuned on clip prefixes padded like short takes and saved as
+# lip_reader_3dcnn_early_exit.h5; the report gives frames waited, latency saved and
+# accuracy lost for each confidence threshold.
+FINETUNE_EPOCHS = 60  # Fine-tuning epochs on prefixes (early stopping may end sooner)
+FINETUNE_LEARNING_RATE = 0.0002
+THRESHOLDS = (60.0, 70.0, 80.0, 90.0, 95.0)  # Confidence thresholds (percent) compared in the report
+CAMERA_FPS = 30.0  # Frame rate used to turn frames waited into capture latency
+SEED = 42
+
+
+def pad_prefixes(X, lengths):
+    """Keep the first lengths[i] frames of clip i and repeat its last kept frame up to WINDOW_FRAMES"""
+    frames = tf.minimum(tf.range(WINDOW_FRAMES)[tf.newaxis], lengths[:, tf.newaxis] - 1)
+    return tf.gather(X, frames, axis=1, batch_dims=1)
+
+
+def with_random_prefixes(dataset):
+    """Truncate every training clip to a random exit point (or leave it whole)"""
+    choices = tf.constant(EARLY_EXIT_FRAMES + (WINDOW_FRAMES,), dtype=tf.int32)
+
+    def truncate(X, y):
+        picks = tf.random.uniform([tf.shape(X)[0]], 0, len(choices), dtype=tf.int32)
+        return pad_prefixes(X, tf.gather(choices, picks)), y
+
+    return dataset.map(truncate).prefetch(tf.data.AUTOTUNE)
+
+
+def prefix_clips(X, length):
+    return X[:, np.minimum(np.arange(WINDOW_FRAMES), length - 1)]
+
+
+def predict_all(classifier, X, batch_size=32):
+    return np.concatenate([classifier.predict(X[i:i + batch_size]) for i in range(0, len(X), batch_size)])
+
+
+def main():
+    if not os.path.exists(MODEL_PATHS["keras"]):
+        print(f"[ERROR] Model not found at {MODEL_PATHS['keras']}. Please run train_model.py first.")
+        sys.exit(1)
+    model = compile_model(tf.keras.models.load_model(MODEL_PATHS["keras"]), learning_rate=FINETUNE_LEARNING_RATE)
+
+    store = open_store()
+    num_classes = len(store.words)
+    train_dataset, val_dataset, (_, val_idx, _, y_val) = prepare_datasets(store, np.arange(len(store)), store.labels,
+                                                                          num_classes, SEED)
+
+    print(f"\nFine-tuning on prefixes of {', '.join(map(str, EARLY_EXIT_FRAMES))} and {WINDOW_FRAMES} frames...\n")
+    model.fit(with_random_prefixes(train_dataset), epochs=FINETUNE_EPOCHS, validation_data=val_dataset,
+              callbacks=training_callbacks(), verbose=1)
+    model.save(MODEL_PATHS["keras_early_exit"])
+    print(f"\n[OK] Early-exit model saved to {MODEL_PATHS['keras_early_exit']}")
+
+    # ==== SIMULATE THE EARLY-EXIT POLICY ====
+    X_val = store.get(val_idx)
+    baseline = np.mean(np.argmax(predict_all(load_classifier("keras"), X_val), axis=1) == y_val)
+    early = load_classifier("keras_early_exit")
+    probabilities = {length: predict_all(early, prefix_clips(X_val, length))
+                     for length in EARLY_EXIT_FRAMES + (WINDOW_FRAMES,)}
+
+    print("\nAccuracy of the early-exit model by clip length:")
+    for length, p in probabilities.items():
+        print(f"  {length:2d} frames: {np.mean(np.argmax(p, axis=1) == y_val) * 100:6.2f}%")
+
+    print("\n" + "=" * 92)
+    print(f"{'Threshold':>9s} {'Frames':>7s} {'Saved':>9s} {'Accuracy':>9s} {'Lost':>8s}  Exits "
+          f"({' / '.join(map(str, EARLY_EXIT_FRAMES + (WINDOW_FRAMES,)))} frames)")
+    print("=" * 92)
+    for threshold in THRESHOLDS:
+        predicted = np.argmax(probabilities[WINDOW_FRAMES], axis=1)
+        frames_used = np.full(len(y_val), WINDOW_FRAMES)
+        decided = np.zeros(len(y_val), dtype=bool)
+        exits = []
+        for length in EARLY_EXIT_FRAMES:
+            p = probabilities[length]
+            exit_now = ~decided & (p.max(axis=1) * 100 >= threshold)
+            predicted[exit_now] = np.argmax(p[exit_now], axis=1)
+            frames_used[exit_now] = length
+            decided |= exit_now
+            exits.append(np.mean(exit_now))
+        exits.append(1 - np.mean(decided))
+
+        accuracy = np.mean(predicted == y_val)
+        saved_ms = (WINDOW_FRAMES - frames_used.mean()) / CAMERA_FPS * 1000
+        print(f"{threshold:8.0f}% {frames_used.mean():7.1f} {saved_ms:6.0f} ms {accuracy * 100:8.2f}% "
+              f"{(baseline - accuracy) * 100:+7.2f}%  {' / '.join(f'{e * 100:.0f}%' for e in exits)}")
+    print("=" * 92)
+    print(f"Lost = accuracy of the original model on full clips ({baseline * 100:.2f}%) minus early-exit accuracy.")
+    print("Set EARLY_EXIT_THRESHOLD in src/streaming.py and INFERENCE_BACKEND = \"keras_early_exit\" in "
+          "src/inference.py to use it live.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import os
+import numpy as np
+import sys
+import time
+import tensorflow as tf
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.dataset import open_store
+from src.inference import MODEL_PATHS, load_classifier
+from src.train_model import split_dataset
+
+# ==== EXPORT SETTINGS ====
+# lip_reader_3dcnn_dynamic.tflite has int8 weights and float activations; lip_reader_3dcnn_int8.tflite
+# is int8, calibrated on training samples. MaxPool3D has no TFLite builtin and runs as a float
+# TF Select op, so the int8 model is not integer-only.
+CALIBRATION_SAMPLES = 100  # Training samples fed to the int8 converter for calibration
+LATENCY_RUNS = 50  # Timed single-clip inferences; the median is reported
+THROUGHPUT_BATCH = 16  # Clips per batch for the throughput measurement
+THROUGHPUT_RUNS = 5  # Timed batches; the best is reported
+SEED = 42
+
+
+def convert(model, calibration=None):
+    """Convert a Keras model to TFLite; int8 (with float TF-op fallback) if calibration samples are given"""
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    # MaxPool3D has no TFLite builtin; it runs through the TF Select (Flex) kernels
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS, tf.lite.OpsSet.SELECT_TF_OPS]
+    if calibration is not None:
+        def representative_dataset():
+            for i in range(len(calibration)):
+                yield [calibration[i:i + 1]]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8, tf.lite.OpsSet.SELECT_TF_OPS]
+    return converter.convert()
+
+
+def benchmark(classifier, X):
+    """Median single-clip latency (ms) and best batch throughput (clips/sec)"""
+    clip = X[:1]
+    for _ in range(5):  # Warm-up
+        classifier.predict(clip)
+    timings = []
+    for _ in range(LATENCY_RUNS):
+        start_time = time.perf_counter()
+        classifier.predict(clip)
+        timings.append(time.perf_counter() - start_time)
+
+    batch = X[np.arange(THROUGHPUT_BATCH) % len(X)]
+    classifier.predict(batch)  # Warm-up at the batch size
+    best = float("inf")
+    for _ in range(THROUGHPUT_RUNS):
+        start_time = time.perf_counter()
+        classifier.predict(batch)
+        best = min(best, time.perf_counter() - start_time)
+    return float(np.median(timings)) * 1000, len(batch) / best
+
+
+def main():
+    if not os.path.exists(MODEL_PATHS["keras"]):
+        print(f"[ERROR] Model not found at {MODEL_PATHS['keras']}. Please run train_model.py first.")
+        sys.exit(1)
+    model = tf.keras.models.load_model(MODEL_PATHS["keras"])
+
+    # Same split as train_model.py: calibrate on training samples, verify on validation samples
+    store = open_store()
+    train_idx, val_idx, _, y_val = split_dataset(np.arange(len(store)), store.labels, len(store.words))
+    rng = np.random.default_rng(SEED)
+    calibration_idx = np.sort(rng.choice(train_idx, min(CALIBRATION_SAMPLES, len(train_idx)), replace=False))
+    X_val = store.get(val_idx)
+
+    print("\n[INFO] Converting with dynamic-range quantisation...")
+    with open(MODEL_PATHS["tflite_dynamic"], "wb") as f:
+        f.write(convert(model))
+    print(f"[INFO] Converting with int8 quantisation and float TF-op fallback "
+          f"({len(calibration_idx)} calibration samples)...")
+    with open(MODEL_PATHS["tflite_int8"], "wb") as f:
+        f.write(convert(model, store.get(calibration_idx)))
+
+    # ==== VERIFY AND BENCHMARK ====
+    results = {}
+    reference = None
+    for backend in ("keras", "tflite_dynamic", "tflite_int8"):
+        classifier = load_classifier(backend)
+        predicted = np.concatenate([np.argmax(classifier.predict(X_val[i:i + 1]), axis=1) for i in range(len(X_val))])
+        if reference is None:
+            reference = predicted
+        latency, throughput = benchmark(classifier, X_val)
+        results[backend] = (os.path.getsize(MODEL_PATHS[backend]), np.mean(predicted == y_val),
+                            np.mean(predicted == reference), latency, throughput)
+        print(f"[OK] {backend}: verified on {len(X_val)} held-out samples")
+
+    print("\n" + "=" * 86)
+    print(f"{'Backend':16s} {'Size':>10s} {'Accuracy':>9s} {'Agreement':>10s} {'Latency':>11s} {'Throughput':>16s}")
+    print("=" * 86)
+    for backend, (size, accuracy, agreement, latency, throughput) in results.items():
+        print(f"{backend:16s} {size / 1024:7.0f} KB {accuracy * 100:8.2f}% {agreement * 100:9.2f}% "
+              f"{latency:8.2f} ms {throughput:10.1f} clips/s")
+    print("=" * 86)
+    print("Agreement = share of held-out clips where the backend predicts the same word as Keras.")
+    print("Set INFERENCE_BACKEND in src/inference.py to choose the backend.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import numpy as np
+import shutil
+import sys
+import time
+import tensorflow as tf
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.build_manifest import MANIFEST_DIR
+from src.dataset import open_store
+from src.inference import MODEL_DIR, MODEL_PATHS
+from src.model_variants import classifier_head
+from src.train_model import split_dataset, compile_model, training_callbacks
+
+# ==== HEAD TRAINING SETTINGS ====
+# Only the classifier head is retrained for the current word list. Features of the frozen
+# trunk are cached in cache/trunk_features.npz, so only new samples go through it.
+HEAD_EPOCHS = 300  # Epochs over the cached features are cheap (early stopping may end sooner)
+HEAD_BATCH_SIZE = 32
+HEAD_LEARNING_RATE = 0.001
+FEATURE_CACHE_PATH = os.path.join(MANIFEST_DIR, "trunk_features.npz")
+PREVIOUS_MODEL_PATH = os.path.join(MODEL_DIR, "lip_reader_3dcnn_previous.h5")
+SEED = 42
+
+
+def split_trunk(model):
+    """Return the trunk layers (before the first Dense layer) and the hidden Dense widths of the head"""
+    dense_layers = [i for i, layer in enumerate(model.layers) if isinstance(layer, tf.keras.layers.Dense)]
+    if len(dense_layers) != 3:
+        print("[ERROR] Expected a model with a three-layer Dense head, as built by train_model.py.")
+        sys.exit(1)
+    dense_units = tuple(model.layers[i].units for i in dense_layers[:2])
+    return model.layers[:dense_layers[0]], dense_units
+
+
+def trunk_fingerprint(trunk_layers):
+    """Hash of the trunk weights; cached features are only valid for identical weights"""
+    digest = hashlib.sha256()
+    for layer in trunk_layers:
+        for weights in layer.get_weights():
+            digest.update(weights.tobytes())
+    return digest.hexdigest()
+
+
+def sample_cache_keys(store):
+    """Key of each store sample that changes whenever its .npy file does"""
+    stats = {}
+    for word, files in store.fingerprint.items():
+        for name, size, mtime in files:
+            stats[os.path.join(word, name)] = f"{size}:{mtime}"
+    return [f"{key}:{stats[key]}" for key in store.keys]
+
+
+def load_feature_cache(fingerprint):
+    if os.path.exists(FEATURE_CACHE_PATH):
+        cache = np.load(FEATURE_CACHE_PATH)
+        if str(cache["fingerprint"]) == fingerprint:
+            return dict(zip(cache["keys"].tolist(), cache["features"]))
+    return {}
+
+
+def save_feature_cache(fingerprint, features):
+    os.makedirs(MANIFEST_DIR, exist_ok=True)
+    tmp_path = f"{FEATURE_CACHE_PATH}.tmp.npz"
+    np.savez(tmp_path, fingerprint=fingerprint, keys=np.array(list(features)),
+             features=np.stack(list(features.values())))
+    os.replace(tmp_path, FEATURE_CACHE_PATH)
+
+
+def trunk_features(trunk, trunk_layers, store):
+    """Features of every store sample, computing only those missing from the cache"""
+    fingerprint = trunk_fingerprint(trunk_layers)
+    cached = load_feature_cache(fingerprint)
+    keys = sample_cache_keys(store)
+    missing = np.array([i for i, key in enumerate(keys) if key not in cached], dtype=np.int64)
+    print(f"[INFO] Trunk features: {len(keys) - len(missing)} cached, {len(missing)} to compute")
+
+    if len(missing) > 0:
+        for start in range(0, len(missing), HEAD_BATCH_SIZE):
+            batch = missing[start:start + HEAD_BATCH_SIZE]
+            for i, feature in zip(batch, np.asarray(trunk(store.get(batch), training=False))):
+                cached[keys[i]] = feature
+        save_feature_cache(fingerprint, {key: cached[key] for key in keys})  # Drops features of removed samples
+    return np.stack([cached[key] for key in keys])
+
+
+def main():
+    start_time = time.perf_counter()
+    model_path = MODEL_PATHS["keras"]
+    if not os.path.exists(model_path):
+        print(f"[ERROR] Model not found at {model_path}. Please run train_model.py first.")
+        sys.exit(1)
+    model = tf.keras.models.load_model(model_path)
+    trunk_layers, dense_units = split_trunk(model)
+    for layer in trunk_layers:
+        layer.trainable = False
+    trunk = tf.keras.Model(model.inputs, trunk_layers[-1].output)
+
+    store = open_store()
+    words = store.words
+    num_classes = len(words)
+    print(f"\n[INFO] Model has {model.output_shape[-1]} words, processed_data has {num_classes}: {', '.join(words)}")
+
+    features = trunk_features(trunk, trunk_layers, store)
+
+    # ==== TRAIN THE HEAD ON CACHED FEATURES ====
+    tf.keras.utils.set_random_seed(SEED)
+    train_idx, val_idx, y_train, y_val = split_dataset(np.arange(len(store)), store.labels, num_classes)
+    # Named head layers cannot clash with the auto-named trunk layers when both are assembled below
+    head = compile_model(tf.keras.Sequential([tf.keras.Input(shape=features.shape[1:])] +
+                                             classifier_head(num_classes, dense_units, prefix="head")),
+                         learning_rate=HEAD_LEARNING_RATE)
+    print(f"\nTraining the classifier head ({head.count_params():,} parameters)...\n")
+    head.fit(features[train_idx], tf.keras.utils.to_categorical(y_train, num_classes=num_classes),
+             epochs=HEAD_EPOCHS, batch_size=HEAD_BATCH_SIZE,
+             validation_data=(features[val_idx], tf.keras.utils.to_categorical(y_val, num_classes=num_classes)),
+             callbacks=training_callbacks(), verbose=0)
+
+    # ==== ASSEMBLE AND SAVE ====
+    extended = compile_model(tf.keras.Sequential([tf.keras.Input(shape=model.input_shape[1:])] + trunk_layers +
+                                                 head.layers))
+    val_probabilities = np.concatenate([np.asarray(extended(X_batch, training=False))
+                                        for X_batch in store.batches(val_idx, HEAD_BATCH_SIZE)])
+    accuracy = np.mean(np.argmax(val_probabilities, axis=1) == y_val)
+
+    # The trunk was only frozen for head training; later fine-tunes of the saved model train it all
+    for layer in extended.layers:
+        layer.trainable = True
+    shutil.copy2(model_path, PREVIOUS_MODEL_PATH)
+    extended.save(model_path)
+    print(f"[OK] Extended model saved to {model_path} (previous model kept as {PREVIOUS_MODEL_PATH})")
+    print(f"[INFO] Validation accuracy: {accuracy * 100:.2f}% over {num_classes} words")
+    print(f"[INFO] Total time: {time.perf_counter() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
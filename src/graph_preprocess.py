@@ -0,0 +1,230 @@
+import cv2
+import os
+import numpy as np
+import sys
+import time
+import tensorflow as tf
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.export_tflite import convert
+from src.inference import MODEL_PATHS
+from src.preprocess import (INPUT_DIR, REQUIRED_FRAMES, FRAME_SHAPE, PREPROCESS_PROFILE, PREPROCESS_PROFILES,
+                            SHARPEN_KERNEL, SHARPEN_BLUR_KERNEL, BatchPreprocessor, frames_to_sample, frame_number)
+
+# ==== SERVING MODEL SETTINGS ====
+# LipPreprocessing runs preprocess.py's filter chain on raw uint8 BGR crops with TF ops, matching
+# OpenCV except for rounding in the float filters. Running this file saves the serving models
+# (the "keras_serving" and "tflite_serving" backends) and checks them against OpenCV.
+SERVING_MODEL_PATH = MODEL_PATHS["keras_serving"]
+SERVING_TFLITE_PATH = MODEL_PATHS["tflite_serving"]
+RAW_INPUT_SHAPE = (REQUIRED_FRAMES,) + FRAME_SHAPE + (3,)  # Resized BGR lip crops, as saved in data/
+VERIFY_TAKES = 64  # Raw takes compared against BatchPreprocessor (spread over all words)
+LATENCY_RUNS = 20  # Timed single-clip runs; the median is reported
+THROUGHPUT_BATCH = 16
+
+# OpenCV's fixed-point BGR -> gray weights (Q14) and the binomial kernels its 8-bit
+# GaussianBlur uses for sigma=0 (5x5 weights sum to 256, 3x3 to 16)
+GRAY_WEIGHTS = (1868, 9617, 4899)
+GAUSSIAN_5X5 = np.outer([1, 4, 6, 4, 1], [1, 4, 6, 4, 1]).astype(np.float32)
+GAUSSIAN_3X3 = np.outer([1, 2, 1], [1, 2, 1]).astype(np.float32)
+BILATERAL_RADIUS = 2  # cv2.bilateralFilter(img, 5, 75, 75)
+BILATERAL_SIGMA_COLOR = 75.0
+BILATERAL_SIGMA_SPACE = 75.0
+# Compare-exchange network that leaves the median of 9 values at index 4 (Paeth), far
+# cheaper than sorting every 3x3 neighbourhood
+MEDIAN_9_NETWORK = ((1, 2), (4, 5), (7, 8), (0, 1), (3, 4), (6, 7), (1, 2), (4, 5), (7, 8), (0, 3),
+                    (5, 8), (4, 7), (3, 6), (1, 4), (2, 5), (4, 7), (4, 2), (6, 4), (4, 2))
+
+
+def pad(images, radius, mode="REFLECT"):
+    """Pad a (N, H, W) stack; "REFLECT" is OpenCV's BORDER_REFLECT_101, "SYMMETRIC" with radius 1 its BORDER_REPLICATE"""
+    return tf.pad(images, [[0, 0], [radius, radius], [radius, radius]], mode=mode)
+
+
+def shifted(padded, radius, height, width):
+    """Yield ((dy, dx), view) for every offset of a (2 * radius + 1)^2 neighbourhood of a padded stack"""
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            yield (dy, dx), padded[:, radius + dy:radius + dy + height, radius + dx:radius + dx + width]
+
+
+def filter2d(images, kernel):
+    """Correlate a (N, H, W) float stack with a 2-D kernel, reflecting borders like cv2.filter2D"""
+    radius = kernel.shape[0] // 2
+    padded = pad(images, radius)[..., tf.newaxis]
+    return tf.nn.conv2d(padded, kernel[:, :, np.newaxis, np.newaxis], strides=1, padding="VALID")[..., 0]
+
+
+def saturate(images):
+    """Round to the nearest integer (ties to even, like cvRound) and clip to the uint8 range"""
+    return tf.clip_by_value(tf.round(images), 0.0, 255.0)
+
+
+@tf.keras.utils.register_keras_serializable(package="lip_reader")
+class LipPreprocessing(tf.keras.layers.Layer):
+    """preprocess.py's filter chain as a layer: (N, T, H, W, 3) uint8 BGR -> (N, T, H, W, 1) float32 in [0, 1]"""
+
+    def __init__(self, profile=PREPROCESS_PROFILE, **kwargs):
+        super().__init__(**kwargs)
+        if profile not in PREPROCESS_PROFILES:
+            raise ValueError(f"Unknown preprocessing profile '{profile}', expected one of {PREPROCESS_PROFILES}")
+        self.profile = profile
+        offsets = [(dy, dx) for dy in range(-BILATERAL_RADIUS, BILATERAL_RADIUS + 1)
+                   for dx in range(-BILATERAL_RADIUS, BILATERAL_RADIUS + 1)]
+        # OpenCV only uses the offsets inside the circle of the given radius
+        self.space_weights = {(dy, dx): np.float32(np.exp(-(dy * dy + dx * dx) / (2 * BILATERAL_SIGMA_SPACE ** 2)))
+                              for dy, dx in offsets if dy * dy + dx * dx <= BILATERAL_RADIUS ** 2}
+
+    def get_config(self):
+        config = super().get_config()
+        config.update({"profile": self.profile})
+        return config
+
+    def call(self, inputs):
+        shape = tf.shape(inputs)
+        height, width = FRAME_SHAPE
+        images = tf.reshape(tf.cast(inputs, tf.int32), [-1, height, width, 3])
+
+        # === Step 1: Convert to Grayscale (fixed point, as cv2.COLOR_BGR2GRAY) ===
+        b, g, r = images[..., 0], images[..., 1], images[..., 2]
+        gray = tf.bitwise.right_shift(b * GRAY_WEIGHTS[0] + g * GRAY_WEIGHTS[1] + r * GRAY_WEIGHTS[2] + (1 << 13), 14)
+        gray = tf.cast(gray, tf.float32)
+
+        # === Step 2: Gaussian Blurring (Reduce Noise) ===
+        blurred = tf.floor((filter2d(gray, GAUSSIAN_5X5) + 128) / 256)
+
+        # === Step 3: Contrast Stretching (Enhance Visibility) ===
+        min_pixel = tf.reduce_min(blurred, axis=[1, 2], keepdims=True)
+        max_pixel = tf.reduce_max(blurred, axis=[1, 2], keepdims=True)
+        stretched = tf.cast(blurred - min_pixel, tf.float64) / tf.cast(max_pixel - min_pixel + 1e-5, tf.float64) * 255
+        contrast_stretched = tf.cast(tf.floor(stretched), tf.float32)
+
+        if self.profile == "fast":
+            # === Step 4: Median Filtering (Cheap Edge-Preserving Smoothing) ===
+            neighbours = [view for _, view in shifted(pad(contrast_stretched, 1, "SYMMETRIC"), 1, height, width)]
+            for a, b in MEDIAN_9_NETWORK:
+                neighbours[a], neighbours[b] = tf.minimum(neighbours[a], neighbours[b]), \
+                    tf.maximum(neighbours[a], neighbours[b])
+            smoothed = neighbours[4]
+
+            # === Steps 5 + 6: Sharpening and Final Blurring in One Fused Kernel ===
+            final_processed = saturate(filter2d(smoothed, SHARPEN_BLUR_KERNEL))
+        else:
+            # === Step 4: Bilateral Filtering (Smooth Noise, Keep Edges) ===
+            padded = pad(contrast_stretched, BILATERAL_RADIUS)
+            weighted_sum = tf.zeros_like(contrast_stretched)
+            weight_sum = tf.zeros_like(contrast_stretched)
+            for offset, view in shifted(padded, BILATERAL_RADIUS, height, width):
+                if offset not in self.space_weights:
+                    continue
+                diff = view - contrast_stretched
+                weight = self.space_weights[offset] * tf.exp(diff * diff * (-0.5 / BILATERAL_SIGMA_COLOR ** 2))
+                weighted_sum += weight * view
+                weight_sum += weight
+            # OpenCV's vectorised loop truncates the result; the columns within the radius of the
+            # left and right border go through its scalar loop, which rounds
+            columns = tf.range(width)
+            scalar_columns = (columns < BILATERAL_RADIUS) | (columns >= width - BILATERAL_RADIUS)
+            bilateral_filtered = tf.where(scalar_columns, tf.round(weighted_sum / weight_sum),
+                                          tf.floor(weighted_sum / weight_sum))
+
+            # === Step 5: Sharpening (Enhance Lip Edges) ===
+            sharpened = saturate(filter2d(bilateral_filtered, SHARPEN_KERNEL))
+
+            # === Step 6: Final Gaussian Blurring (Prevent Over-Sharpening Artifacts) ===
+            final_processed = tf.floor((filter2d(sharpened, GAUSSIAN_3X3) + 8) / 16)
+
+        # Normalise like frames_to_sample and restore the (N, T, H, W, 1) layout
+        normalised = final_processed / np.float32(255.0)
+        return tf.reshape(normalised, tf.concat([shape[:-1], [1]], axis=0))
+
+    def compute_output_shape(self, input_shape):
+        return tuple(input_shape[:-1]) + (1,)
+
+
+def build_serving_model(model, profile=PREPROCESS_PROFILE):
+    """Model taking raw uint8 BGR clips: LipPreprocessing followed by the trained classifier"""
+    inputs = tf.keras.Input(shape=RAW_INPUT_SHAPE, dtype="uint8", name="lip_crops")
+    outputs = model(LipPreprocessing(profile, name="lip_preprocessing")(inputs))
+    return tf.keras.Model(inputs, outputs, name=f"{model.name}_serving")
+
+
+def load_raw_clip(take_path):
+    """The first REQUIRED_FRAMES BGR crops of a take in data/, padded by repeating the last one"""
+    frame_files = sorted(os.listdir(take_path), key=frame_number)[:REQUIRED_FRAMES]
+    frames = np.stack([cv2.imread(os.path.join(take_path, frame_file)) for frame_file in frame_files])
+    return frames[np.minimum(np.arange(REQUIRED_FRAMES), len(frames) - 1)]
+
+
+def list_raw_takes():
+    takes = []
+    for word in sorted(os.listdir(INPUT_DIR)):
+        word_path = os.path.join(INPUT_DIR, word)
+        if os.path.isdir(word_path):
+            takes += [os.path.join(word_path, take) for take in sorted(os.listdir(word_path))
+                      if os.path.isdir(os.path.join(word_path, take))]
+    return takes
+
+
+def time_median(function, runs=LATENCY_RUNS):
+    function()  # Warm-up
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start_time)
+    return float(np.median(timings))
+
+
+def main():
+    if not os.path.exists(MODEL_PATHS["keras"]):
+        print(f"[ERROR] Model not found at {MODEL_PATHS['keras']}. Please run train_model.py first.")
+        sys.exit(1)
+    if not os.path.exists(INPUT_DIR):
+        print(f"[ERROR] {INPUT_DIR} does not exist. Please run collection.py first to collect data.")
+        sys.exit(1)
+    model = tf.keras.models.load_model(MODEL_PATHS["keras"])
+    serving = build_serving_model(model)
+    serving.save(SERVING_MODEL_PATH)
+    with open(SERVING_TFLITE_PATH, "wb") as f:
+        f.write(convert(serving))
+    print(f"[OK] Serving model ({PREPROCESS_PROFILE} preprocessing) saved to {SERVING_MODEL_PATH} "
+          f"and {SERVING_TFLITE_PATH}")
+
+    # ==== VERIFY AGAINST BATCHPREPROCESSOR ====
+    takes = list_raw_takes()
+    takes = [takes[i] for i in np.linspace(0, len(takes) - 1, min(VERIFY_TAKES, len(takes))).astype(int)]
+    raw = np.stack([load_raw_clip(take) for take in takes])
+    preprocessor = BatchPreprocessor(PREPROCESS_PROFILE)
+    reference = np.stack([frames_to_sample(preprocessor(clip)) for clip in raw])[..., np.newaxis]
+    in_graph = np.asarray(LipPreprocessing(PREPROCESS_PROFILE)(raw))
+
+    pixel_diff = np.abs(np.rint(in_graph * 255) - np.rint(reference * 255))
+    agreement = np.mean(np.argmax(model.predict(reference, verbose=0), axis=1) ==
+                        np.argmax(serving.predict(raw, verbose=0), axis=1))
+    print(f"\n[INFO] {len(takes)} raw takes: {np.mean(pixel_diff > 0) * 100:.3f}% of pixels differ from OpenCV "
+          f"(max {pixel_diff.max():.0f} grey levels), predictions agree on {agreement * 100:.1f}%")
+
+    # ==== LATENCY ====
+    clip, batch = raw[:1], raw[np.arange(THROUGHPUT_BATCH) % len(raw)]
+    classify = tf.function(lambda X: model(X, training=False))
+    separate = lambda clips: classify(np.stack([frames_to_sample(preprocessor(c)) for c in clips])[..., np.newaxis])
+    fused = tf.function(lambda clips: serving(clips, training=False))
+    print("\n" + "=" * 62)
+    print(f"{'Path':28s} {'Clip ms':>10s} {'Batch clips/sec':>20s}")
+    print("=" * 62)
+    for name, run in (("OpenCV + model", separate), ("In-graph preprocessing", fused)):
+        latency = time_median(lambda: run(clip))
+        throughput = len(batch) / time_median(lambda: run(batch), runs=5)
+        print(f"{name:28s} {latency * 1000:10.2f} {throughput:20.1f}")
+    print("=" * 62)
+    print("Set INFERENCE_BACKEND = \"keras_serving\" (or \"tflite_serving\") in src/inference.py to use the serving "
+          "model live and in /api/predict_clip.")
+
+
+if __name__ == "__main__":
+    main()
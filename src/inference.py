@@ -0,0 +1,106 @@
+import os
+import numpy as np
+import sys
+import threading
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+# ==== INFERENCE BACKENDS ====
+# Every backend takes float32 clips (N, 22, 80, 112, 1) in [0, 1] and returns softmax
+# probabilities (N, num_words), so they can be swapped without touching the callers.
+# The serving backends (RAW_INPUT_BACKENDS) run preprocess.py's filter chain inside the
+# model and take raw uint8 BGR lip crops (N, 22, 80, 112, 3) instead; their classifiers
+# set raw_input so callers can skip OpenCV preprocessing.
+MODEL_DIR = os.path.join(PROJECT_ROOT, "model")
+MODEL_PATHS = {
+    "keras": os.path.join(MODEL_DIR, "lip_reader_3dcnn.h5"),
+    "keras_pruned": os.path.join(MODEL_DIR, "lip_reader_3dcnn_pruned.h5"),  # Written by prune_model.py
+    "keras_early_exit": os.path.join(MODEL_DIR, "lip_reader_3dcnn_early_exit.h5"),  # Written by early_exit.py
+    "tflite_dynamic": os.path.join(MODEL_DIR, "lip_reader_3dcnn_dynamic.tflite"),  # Written by export_tflite.py
+    # int8 with float TF Select fallback for ops like MaxPool3D; written by export_tflite.py
+    "tflite_int8": os.path.join(MODEL_DIR, "lip_reader_3dcnn_int8.tflite"),
+    "keras_serving": os.path.join(MODEL_DIR, "lip_reader_3dcnn_serving.h5"),  # Written by graph_preprocess.py
+    "tflite_serving": os.path.join(MODEL_DIR, "lip_reader_3dcnn_serving.tflite"),  # Written by graph_preprocess.py
+}
+RAW_INPUT_BACKENDS = ("keras_serving", "tflite_serving")
+INFERENCE_BACKEND = "keras"
+INFERENCE_THREADS = None  # CPU threads for the TFLite interpreter; None = TFLite default
+
+
+class KerasClassifier:
+    """Backend running a Keras .h5 model"""
+
+    def __init__(self, model_path, raw_input=False):
+        import tensorflow as tf
+        self.model = tf.keras.models.load_model(model_path)
+        self.num_classes = self.model.output_shape[-1]
+        self.raw_input = raw_input
+
+    def predict(self, X):
+        # Calling the model directly skips the per-call overhead of model.predict
+        return np.asarray(self.model(X, training=False))
+
+
+class TFLiteClassifier:
+    """Backend running a .tflite model, quantised or not"""
+
+    def __init__(self, model_path, raw_input=False, num_threads=INFERENCE_THREADS):
+        try:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter  # Links the Flex delegate needed for MaxPool3D
+        except ImportError:
+            from tflite_runtime.interpreter import Interpreter  # Standalone runtime; needs a build with Flex ops
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.num_classes = self.output["shape"][-1]
+        self.batch_size = self.input["shape"][0]
+        self.raw_input = raw_input
+        self.lock = threading.Lock()  # An interpreter must not be invoked from two threads at once
+
+    def predict(self, X):
+        if self.raw_input:  # Raw uint8 lip crops go in unchanged
+            X = np.asarray(X, dtype=self.input["dtype"])
+        elif self.input["dtype"] != np.float32:  # Integer input: quantise with the tensor's scale and zero point
+            X = np.asarray(X, dtype=np.float32)
+            scale, zero_point = self.input["quantization"]
+            info = np.iinfo(self.input["dtype"])
+            X = np.clip(np.round(X / scale + zero_point), info.min, info.max).astype(self.input["dtype"])
+        else:
+            X = np.asarray(X, dtype=np.float32)
+
+        with self.lock:
+            if len(X) != self.batch_size:
+                self.interpreter.resize_tensor_input(self.input["index"], (len(X),) + X.shape[1:])
+                self.interpreter.allocate_tensors()
+                self.batch_size = len(X)
+            self.interpreter.set_tensor(self.input["index"], X)
+            self.interpreter.invoke()
+            probabilities = self.interpreter.get_tensor(self.output["index"])
+
+        if self.output["dtype"] != np.float32:
+            scale, zero_point = self.output["quantization"]
+            probabilities = (probabilities.astype(np.float32) - zero_point) * scale
+        return probabilities
+
+
+def load_classifier(backend=INFERENCE_BACKEND, model_path=None):
+    """Load the word classifier with the given backend (see MODEL_PATHS)"""
+    if backend not in MODEL_PATHS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {tuple(MODEL_PATHS)}")
+    model_path = model_path or MODEL_PATHS[backend]
+    if not os.path.exists(model_path):
+        hint = {"keras": "train_model.py", "keras_pruned": "prune_model.py", "keras_early_exit": "early_exit.py",
+                "keras_serving": "graph_preprocess.py", "tflite_serving": "graph_preprocess.py"}.get(backend,
+                                                                                                "export_tflite.py")
+        raise FileNotFoundError(f"Model file not found at {model_path}. Please run {hint} first.")
+    raw_input = backend in RAW_INPUT_BACKENDS
+    if backend.startswith("keras"):
+        if raw_input:
+            import src.graph_preprocess  # Registers the LipPreprocessing layer the serving model is saved with
+        return KerasClassifier(model_path, raw_input)
+    return TFLiteClassifier(model_path, raw_input)
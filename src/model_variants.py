@@ -0,0 +1,94 @@
+import tensorflow as tf
+
+# ==== LIGHTWEIGHT ARCHITECTURES ====
+# Alternatives to the full Conv3D stack of train_model.build_3d_cnn for CPU inference.
+# All of them take the same (22, 80, 112, 1) input and use the same classifier head.
+#   r2plus1d        (2+1)D: every 3x3x3 conv factorised into a 1x3x3 spatial and a 3x1x1 temporal conv
+#   separable3d     per-frame depthwise 3x3 conv followed by a 3x1x1 temporal/pointwise conv
+#   frame2d_conv1d  2D CNN applied to each frame, then temporal Conv1D over the frame features
+#   frame2d_gru     2D CNN applied to each frame, then a GRU over the frame features
+ARCHITECTURES = ("conv3d", "r2plus1d", "separable3d", "frame2d_conv1d", "frame2d_gru")
+
+
+def regularizer():
+    return tf.keras.regularizers.l2(0.01)
+
+
+def classifier_head(num_classes, dense_units, prefix=None):
+    """Dense head shared with the Conv3D model; prefix names its layers (default: Keras auto-names)"""
+    dense1, dense2 = dense_units
+    name = (lambda layer: f"{prefix}_{layer}") if prefix else (lambda layer: None)
+    return [
+        tf.keras.layers.Dense(dense1, activation='relu', kernel_regularizer=regularizer(), name=name("dense_1")),
+        tf.keras.layers.BatchNormalization(name=name("batch_normalization")),
+        tf.keras.layers.Dropout(0.5, name=name("dropout_1")),
+        tf.keras.layers.Dense(dense2, activation='relu', kernel_regularizer=regularizer(), name=name("dense_2")),
+        tf.keras.layers.Dropout(0.5, name=name("dropout_2")),
+        tf.keras.layers.Dense(num_classes, activation='softmax', name=name("output"))
+    ]
+
+
+def r2plus1d_block(filters, pool):
+    layers = [
+        tf.keras.layers.Conv3D(filters, (1, 3, 3), activation='relu', kernel_regularizer=regularizer()),
+        tf.keras.layers.Conv3D(filters, (3, 1, 1), activation='relu', kernel_regularizer=regularizer()),
+        tf.keras.layers.BatchNormalization(),
+    ]
+    if pool:
+        layers.append(tf.keras.layers.MaxPooling3D((2, 2, 2)))
+    return layers + [tf.keras.layers.Dropout(0.3)]
+
+
+def separable3d_block(filters, pool):
+    # Keras has no depthwise Conv3D (and grouped Conv3D is not supported on CPU), so the
+    # depthwise part is a per-frame DepthwiseConv2D and the 3x1x1 conv mixes time and channels
+    layers = [
+        tf.keras.layers.TimeDistributed(tf.keras.layers.DepthwiseConv2D((3, 3), depthwise_regularizer=regularizer())),
+        tf.keras.layers.Conv3D(filters, (3, 1, 1), activation='relu', kernel_regularizer=regularizer()),
+        tf.keras.layers.BatchNormalization(),
+    ]
+    if pool:
+        layers.append(tf.keras.layers.MaxPooling3D((2, 2, 2)))
+    return layers + [tf.keras.layers.Dropout(0.3)]
+
+
+def frame_encoder(filters):
+    """2D CNN turning one (80, 112, 1) frame into a feature vector"""
+    layers = [tf.keras.Input(shape=(80, 112, 1))]
+    for conv_filters in filters:
+        layers += [
+            tf.keras.layers.Conv2D(conv_filters, (3, 3), activation='relu', kernel_regularizer=regularizer()),
+            tf.keras.layers.BatchNormalization(),
+            tf.keras.layers.MaxPooling2D((2, 2)),
+        ]
+    layers.append(tf.keras.layers.GlobalAveragePooling2D())
+    return tf.keras.Sequential(layers, name="frame_encoder")
+
+
+def build_variant(architecture, input_shape, num_classes, filters, dense_units):
+    """Build one of the lightweight architectures (see ARCHITECTURES)"""
+    if architecture in ("r2plus1d", "separable3d"):
+        block = r2plus1d_block if architecture == "r2plus1d" else separable3d_block
+        layers = [tf.keras.Input(shape=input_shape)]
+        for i, conv_filters in enumerate(filters):
+            layers += block(conv_filters, pool=i < len(filters) - 1)
+        layers.append(tf.keras.layers.GlobalAveragePooling3D())
+    elif architecture in ("frame2d_conv1d", "frame2d_gru"):
+        temporal_units = filters[-1]
+        layers = [
+            tf.keras.Input(shape=input_shape),
+            tf.keras.layers.TimeDistributed(frame_encoder(filters)),
+            tf.keras.layers.Dropout(0.3),
+        ]
+        if architecture == "frame2d_conv1d":
+            layers += [
+                tf.keras.layers.Conv1D(temporal_units, 3, activation='relu', kernel_regularizer=regularizer()),
+                tf.keras.layers.BatchNormalization(),
+                tf.keras.layers.GlobalAveragePooling1D(),
+            ]
+        else:
+            layers.append(tf.keras.layers.GRU(temporal_units, kernel_regularizer=regularizer()))
+    else:
+        raise ValueError(f"Unknown architecture '{architecture}', expected one of {ARCHITECTURES}")
+
+    return tf.keras.Sequential(layers + classifier_head(num_classes, dense_units), name=architecture)
@@ -43,13 +43,33 @@ except Exception:
     # If certifi is not available, use unverified context
     ssl._create_default_https_context = ssl._create_unverified_context
 
-try:
-    whisper_model = whisper.load_model("base")  # Load lip reading model
-    print("\n[OK] Lip reading model loaded successfully!")
-except Exception as e:
-    print(f"[ERROR] Failed to load lip reading model: {e}")
-    print("[INFO] Make sure you have internet connection for first-time download")
-    sys.exit(1)
+# Predict words from the lip crops with the trained 3D CNN (src/streaming.py)
+# instead of transcribing the microphone with Whisper
+VISUAL_INFERENCE = True
+recognizer = None
+
+def publish_prediction(word, confidence):
+    """Called by the streaming recognizer with every new prediction"""
+    global predicted_word, prediction_confidence
+    predicted_word = word
+    prediction_confidence = confidence
+
+if VISUAL_INFERENCE:
+    try:
+        from src.streaming import create_recognizer
+        recognizer = create_recognizer(publish_prediction)
+        print("\n[OK] Lip reading model loaded successfully!")
+    except Exception as e:
+        print(f"[ERROR] Failed to load lip reading model: {e}")
+        sys.exit(1)
+else:
+    try:
+        whisper_model = whisper.load_model("base")  # Load lip reading model
+        print("\n[OK] Lip reading model loaded successfully!")
+    except Exception as e:
+        print(f"[ERROR] Failed to load lip reading model: {e}")
+        print("[INFO] Make sure you have internet connection for first-time download")
+        sys.exit(1)
 
 # ==== Setup Dlib Face Detector ====
 SHAPE_PREDICTOR_PATH = os.path.join(PROJECT_ROOT, "model", "shape_predictor_68_face_landmarks.dat")
@@ -276,10 +296,14 @@ def monitor_audio_continuously():
             audio_stream.close()
             audio_stream = None
 
-# Start continuous audio monitoring in background thread
-monitoring_thread = threading.Thread(target=monitor_audio_continuously, daemon=True)
-monitoring_thread.start()
-print("[INFO] Continuous audio monitoring started.")
+if VISUAL_INFERENCE:
+    recognizer.start()
+    print("[INFO] Streaming lip reading started.")
+else:
+    # Start continuous audio monitoring in background thread
+    monitoring_thread = threading.Thread(target=monitor_audio_continuously, daemon=True)
+    monitoring_thread.start()
+    print("[INFO] Continuous audio monitoring started.")
 
 try:
     while True:
@@ -337,6 +361,13 @@ try:
                 print(f"[WARNING] Error processing face: {e}")
                 face_detected = False
 
+        # Feed the lip crop to the streaming recognizer before the UI is drawn on the frame
+        if recognizer is not None:
+            if lip_box:
+                recognizer.push_frame(frame, lip_box)
+            else:
+                recognizer.reset()
+
         # Update recording progress
         if recording and recording_start_time:
             elapsed = time.time() - recording_start_time
@@ -461,6 +492,9 @@ try:
             predicted_word = ""  # Clear previous prediction
             prediction_confidence = 0.0  # Reset confidence
             
+            if VISUAL_INFERENCE:
+                continue  # Predictions stream in from the camera; no audio is recorded
+            
             # Start recording audio in a separate thread (silently, to maintain illusion)
             def record_and_process():
                 audio_data = record_audio(RECORD_SECONDS)
@@ -488,6 +522,8 @@ finally:
     print("[INFO] Cleaning up...")
     # Stop audio monitoring
     audio_monitoring_active = False
+    if recognizer is not None:
+        recognizer.stop()
     if audio_stream:
         try:
             audio_stream.stop_stream()
@@ -2,105 +2,363 @@ import cv2
 import os
 import numpy as np
 import sys
+import time
+from multiprocessing import Pool
 
 # Get the project root directory (parent of src/)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 sys.path.insert(0, PROJECT_ROOT)
 
+from src.build_manifest import (manifest_path, load_manifest, save_manifest, is_up_to_date,
+                                record_build, prune_orphans, directory_fingerprint, absolute_path, replace_output)
+
 # Input and output directories
 INPUT_DIR = os.path.join(PROJECT_ROOT, "data")
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, "processed_data")
 
-# Ensure the output directory exists
-if not os.path.exists(OUTPUT_DIR):
-    os.makedirs(OUTPUT_DIR)
-
-# Get the list of words
-if not os.path.exists(INPUT_DIR):
-    print(f"[ERROR] {INPUT_DIR} does not exist. Please run collection.py first to collect data.")
-    sys.exit(1)
-words = sorted(os.listdir(INPUT_DIR))
-if len(words) == 0:
-    print(f"[ERROR] No words found in {INPUT_DIR}. Please run collection.py first to collect data.")
-    sys.exit(1)
-
-for word in words:
-    word_path = os.path.join(INPUT_DIR, word)
-    
-    if not os.path.isdir(word_path):
-        continue  # Skip if not a directory
-
-    print(f"Processing word: {word}")
-
-    # Create output directory for this word
-    word_output_path = os.path.join(OUTPUT_DIR, word)
-    if not os.path.exists(word_output_path):
-        os.makedirs(word_output_path)
-
-    # Process each take
-    takes = sorted(os.listdir(word_path))
-
-    for take in takes:
-        take_path = os.path.join(word_path, take)
-        if not os.path.isdir(take_path):
+REQUIRED_FRAMES = 22  # Frames per sample
+FRAME_SHAPE = (80, 112)  # (Height, Width) of each frame
+
+# ==== SAMPLE STORAGE ====
+# dtype of the saved .npy samples. "float32" stores normalised [0, 1] values (~790 KB
+# per take); "float16" halves that; "uint8" stores the raw 8-bit pixels (4x smaller,
+# and lossless since the filter chain outputs uint8). Loaders normalise on load.
+SAMPLE_DTYPE = "float32"
+SAMPLE_DTYPES = ("float32", "float16", "uint8")
+
+# ==== INCREMENTAL BUILDS ====
+# Only takes whose frames or preprocessing parameters changed since the last run are
+# reprocessed; samples of takes that were deleted from data/ are removed. Samples written
+# by the fused pipeline of process_videos.py belong to its manifest and are left alone.
+MANIFEST_PATH = manifest_path("preprocess")
+FUSED_MANIFEST_PATH = manifest_path("process_videos")
+FORCE_REBUILD = False
+
+# ==== PARALLEL PROCESSING ====
+# Takes are independent, so they are spread over a pool of worker processes, each
+# limited to a single OpenCV thread. Set to 1 to process takes serially in this process.
+NUM_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+
+# ==== PREPROCESSING PROFILE ====
+# "reference" is the original filter chain. "fast" replaces the bilateral filter with a
+# 3x3 median (a much cheaper edge-preserving smoother) and fuses the sharpening and
+# final blur into a single 5x5 kernel. Compare them with src/compare_profiles.py.
+PREPROCESS_PROFILE = "reference"
+PREPROCESS_PROFILES = ("reference", "fast")
+
+SHARPEN_KERNEL = np.array([[-1, -1, -1],
+                           [-1,  9, -1],
+                           [-1, -1, -1]], dtype=np.float32)
+
+
+def fused_kernel(first, second):
+    """Single kernel equivalent to filtering with first and then second (both symmetric)"""
+    kernel = np.zeros((first.shape[0] + second.shape[0] - 1, first.shape[1] + second.shape[1] - 1), dtype=np.float64)
+    for i in range(second.shape[0]):
+        for j in range(second.shape[1]):
+            kernel[i:i + first.shape[0], j:j + first.shape[1]] += second[i, j] * first
+    return kernel.astype(np.float32)
+
+
+GAUSSIAN_3X3_KERNEL = cv2.getGaussianKernel(3, 0) @ cv2.getGaussianKernel(3, 0).T
+SHARPEN_BLUR_KERNEL = fused_kernel(SHARPEN_KERNEL, GAUSSIAN_3X3_KERNEL)  # Steps 5 and 6 of the "fast" profile
+
+
+def preprocess_frame(image):
+    """Apply the preprocessing chain to one BGR lip crop and return a uint8 frame.
+
+    Reference implementation; takes are processed with BatchPreprocessor.
+    """
+    # === Step 1: Convert to Grayscale ===
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    # === Step 2: Gaussian Blurring (Reduce Noise) ===
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+
+    # === Step 3: Contrast Stretching (Enhance Visibility) ===
+    min_pixel = np.min(blurred)
+    max_pixel = np.max(blurred)
+    contrast_stretched = (blurred - min_pixel) / (max_pixel - min_pixel + 1e-5) * 255  # Avoid division by zero
+    contrast_stretched = contrast_stretched.astype(np.uint8)
+
+    # === Step 4: Bilateral Filtering (Smooth Noise, Keep Edges) ===
+    bilateral_filtered = cv2.bilateralFilter(contrast_stretched, 5, 75, 75)
+
+    # === Step 5: Sharpening (Enhance Lip Edges) ===
+    sharpened = cv2.filter2D(bilateral_filtered, -1, SHARPEN_KERNEL)
+
+    # === Step 6: Final Gaussian Blurring (Prevent Over-Sharpening Artifacts) ===
+    final_processed = cv2.GaussianBlur(sharpened, (3, 3), 0)
+
+    return final_processed
+
+
+class BatchPreprocessor:
+    """Runs the preprocessing chain of preprocess_frame on a whole take at once.
+
+    The frames of a (N, H, W, 3) stack are padded individually (reflecting
+    their own border rows, as OpenCV does per image) and stacked into one tall
+    image, so the colour conversion, blurs and sharpening run once per take
+    instead of once per frame. The contrast stretch goes through a 256-entry
+    lookup table per frame, computed with the same float64 formula as
+    preprocess_frame. The bilateral filter still runs per frame (into a
+    preallocated buffer): on a stacked image OpenCV's vectorised accumulation
+    rounds the frame corners differently. Output is bit-for-bit identical to
+    calling preprocess_frame on every frame. Buffers are allocated for the
+    first stack shape and reused for later stacks of the same shape.
+
+    With profile="fast" the bilateral filter is replaced by a 3x3 median and
+    steps 5 and 6 by one filter with SHARPEN_BLUR_KERNEL. That output is an
+    approximation and differs from the reference chain.
+    """
+
+    def __init__(self, profile=PREPROCESS_PROFILE):
+        if profile not in PREPROCESS_PROFILES:
+            raise ValueError(f"Unknown preprocessing profile '{profile}', expected one of {PREPROCESS_PROFILES}")
+        self.profile = profile
+        self.shape = None
+
+    def _allocate(self, shape):
+        n, h, w = shape
+        self.shape = shape
+        self.gray = np.empty((n, h, w), dtype=np.uint8)
+        self.work = np.empty((n, h, w), dtype=np.uint8)
+        self.result = np.empty((n, h, w), dtype=np.uint8)
+        self.padded = {radius: np.empty((n, h + 2 * radius, w), dtype=np.uint8) for radius in (1, 2)}
+
+    def _filter(self, src, out, radius, apply, replicate_border=False):
+        """Apply a per-image OpenCV filter with the given radius to every frame of src"""
+        n, h, w = src.shape
+        padded = self.padded[radius]
+        padded[:, radius:radius + h] = src
+        if replicate_border:
+            # Repeat the border row (BORDER_REPLICATE, used by medianBlur)
+            padded[:, :radius] = src[:, :1]
+            padded[:, radius + h:] = src[:, h - 1:]
+        else:
+            # Reflect without repeating the border row (OpenCV's BORDER_REFLECT_101)
+            padded[:, :radius] = src[:, radius:0:-1]
+            padded[:, radius + h:] = src[:, h - 2:h - 2 - radius:-1]
+        filtered = apply(padded.reshape(n * (h + 2 * radius), w))
+        out[...] = filtered.reshape(n, h + 2 * radius, w)[:, radius:radius + h]
+        return out
+
+    def __call__(self, images):
+        """Preprocess a (N, H, W, 3) uint8 BGR stack into a (N, H, W) uint8 stack.
+
+        The returned array is an internal buffer that is overwritten by the next call.
+        """
+        images = np.ascontiguousarray(images, dtype=np.uint8)
+        n, h, w = images.shape[:3]
+        if self.shape != (n, h, w):
+            self._allocate((n, h, w))
+
+        # === Step 1: Convert to Grayscale ===
+        self.gray[...] = cv2.cvtColor(images.reshape(n * h, w, 3), cv2.COLOR_BGR2GRAY).reshape(n, h, w)
+
+        # === Step 2: Gaussian Blurring (Reduce Noise) ===
+        blurred = self._filter(self.gray, self.work, 2, lambda img: cv2.GaussianBlur(img, (5, 5), 0))
+
+        # === Step 3: Contrast Stretching (Enhance Visibility) ===
+        flat = blurred.reshape(n, -1)
+        min_pixel = flat.min(axis=1).astype(np.float64).reshape(n, 1)
+        max_pixel = flat.max(axis=1).astype(np.float64).reshape(n, 1)
+        levels = np.clip(np.arange(256, dtype=np.float64).reshape(1, 256) - min_pixel, 0, max_pixel - min_pixel)
+        luts = (levels / (max_pixel - min_pixel + 1e-5) * 255).astype(np.uint8)
+        contrast_stretched = self.gray
+        for i in range(n):
+            cv2.LUT(blurred[i], luts[i], dst=contrast_stretched[i])
+
+        if self.profile == "fast":
+            # === Step 4: Median Filtering (Cheap Edge-Preserving Smoothing) ===
+            smoothed = self._filter(contrast_stretched, self.work, 1, lambda img: cv2.medianBlur(img, 3),
+                                    replicate_border=True)
+
+            # === Steps 5 + 6: Sharpening and Final Blurring in One Fused Kernel ===
+            return self._filter(smoothed, self.result, 2, lambda img: cv2.filter2D(img, -1, SHARPEN_BLUR_KERNEL))
+
+        # === Step 4: Bilateral Filtering (Smooth Noise, Keep Edges) ===
+        bilateral_filtered = self.work
+        for i in range(n):
+            cv2.bilateralFilter(contrast_stretched[i], 5, 75, 75, dst=bilateral_filtered[i])
+
+        # === Step 5: Sharpening (Enhance Lip Edges) ===
+        sharpened = self._filter(bilateral_filtered, self.gray, 1,
+                                 lambda img: cv2.filter2D(img, -1, SHARPEN_KERNEL))
+
+        # === Step 6: Final Gaussian Blurring (Prevent Over-Sharpening Artifacts) ===
+        return self._filter(sharpened, self.result, 1, lambda img: cv2.GaussianBlur(img, (3, 3), 0))
+
+
+# Shared instance so repeated takes of the same shape reuse its buffers
+preprocess_frames = BatchPreprocessor()
+
+
+def frames_to_sample(frames, dtype="float32"):
+    """Pad or truncate processed uint8 frames to REQUIRED_FRAMES and convert them to dtype.
+
+    Float samples are normalised to [0, 1]; uint8 samples keep the raw pixel
+    values and are normalised when loaded (see dataset.normalise_sample).
+    """
+    sample = np.empty((REQUIRED_FRAMES,) + FRAME_SHAPE, dtype=dtype)
+    count = min(len(frames), REQUIRED_FRAMES)  # Truncate to first 22 frames
+
+    if count > 0:
+        frames = np.asarray(frames[:count])
+        if sample.dtype == np.uint8:
+            sample[:count] = frames
+        elif sample.dtype == np.float32:
+            np.divide(frames, np.float32(255.0), out=sample[:count], dtype=np.float32)  # Normalize pixel values
+        else:
+            sample[:count] = np.divide(frames, np.float32(255.0), dtype=np.float32)
+        # Pad by repeating the last frame
+        sample[count:] = sample[count - 1]
+    else:
+        sample[:] = 0
+
+    return sample
+
+
+def frame_number(frame_file):
+    """Sort key that orders frame_2.png before frame_10.png"""
+    name = os.path.splitext(frame_file)[0]
+    digits = name.rsplit("_", 1)[-1]
+    return (int(digits), name) if digits.isdigit() else (float("inf"), name)
+
+
+def preprocess_take(take_path, dtype="float32"):
+    """Load the PNG frames of a take and return its (22, 80, 112) sample"""
+    frame_files = sorted(os.listdir(take_path), key=frame_number)
+    images = [cv2.imread(os.path.join(take_path, frame_file)) for frame_file in frame_files]
+
+    if len(images) == 0:
+        return frames_to_sample([], dtype)
+    return frames_to_sample(preprocess_frames(np.stack(images)), dtype)
+
+
+def preprocess_params():
+    """Parameters that change the output of a take; editing any of them triggers a rebuild"""
+    return {
+        "required_frames": REQUIRED_FRAMES,
+        "frame_shape": FRAME_SHAPE,
+        "profile": PREPROCESS_PROFILE,
+        "sample_dtype": SAMPLE_DTYPE,
+    }
+
+
+def fused_samples():
+    """Samples currently owned by process_videos.py's fused pipeline (absolute paths)"""
+    manifest = load_manifest(FUSED_MANIFEST_PATH)
+    return {absolute_path(path) for entry in manifest["entries"].values()
+            for path in entry["outputs"] if path.endswith(".npy")}
+
+
+def init_worker():
+    """Limit OpenCV to one thread per worker so the pool does not oversubscribe the cores"""
+    cv2.setNumThreads(1)
+
+
+def process_take(job):
+    """Preprocess one take and save its sample; runs inside a worker process"""
+    key, take_path, npy_path = job
+    frames = preprocess_take(take_path, SAMPLE_DTYPE)
+    replace_output(npy_path, lambda f: np.save(f, frames))
+    return key, frames.shape
+
+
+def main():
+    # Ensure the output directory exists
+    if not os.path.exists(OUTPUT_DIR):
+        os.makedirs(OUTPUT_DIR)
+
+    # Get the list of words
+    if not os.path.exists(INPUT_DIR):
+        print(f"[ERROR] {INPUT_DIR} does not exist. Please run collection.py first to collect data.")
+        sys.exit(1)
+    words = sorted(os.listdir(INPUT_DIR))
+    if len(words) == 0:
+        print(f"[ERROR] No words found in {INPUT_DIR}. Please run collection.py first to collect data.")
+        sys.exit(1)
+
+    manifest = {"entries": {}} if FORCE_REBUILD else load_manifest(MANIFEST_PATH)
+    params = preprocess_params()
+    live_takes = set()
+    fingerprints = {}
+    jobs = []
+    skipped = 0
+    fused = fused_samples()
+
+    for word in words:
+        word_path = os.path.join(INPUT_DIR, word)
+
+        if not os.path.isdir(word_path):
             continue  # Skip if not a directory
 
-        print(f"  -> Processing take: {take}")
-
-        frames = []
-        frame_files = sorted(os.listdir(take_path))
-
-        for frame_file in frame_files:
-            frame_path = os.path.join(take_path, frame_file)
-            image = cv2.imread(frame_path)
-
-            # === Step 1: Convert to Grayscale ===
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-
-            # === Step 2: Gaussian Blurring (Reduce Noise) ===
-            blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-
-            # === Step 3: Contrast Stretching (Enhance Visibility) ===
-            min_pixel = np.min(blurred)
-            max_pixel = np.max(blurred)
-            contrast_stretched = (blurred - min_pixel) / (max_pixel - min_pixel + 1e-5) * 255  # Avoid division by zero
-            contrast_stretched = contrast_stretched.astype(np.uint8)
-
-            # === Step 4: Bilateral Filtering (Smooth Noise, Keep Edges) ===
-            bilateral_filtered = cv2.bilateralFilter(contrast_stretched, 5, 75, 75)
-
-            # === Step 5: Sharpening (Enhance Lip Edges) ===
-            sharpen_kernel = np.array([[-1, -1, -1], 
-                                       [-1,  9, -1], 
-                                       [-1, -1, -1]])
-            sharpened = cv2.filter2D(bilateral_filtered, -1, sharpen_kernel)
-
-            # === Step 6: Final Gaussian Blurring (Prevent Over-Sharpening Artifacts) ===
-            final_processed = cv2.GaussianBlur(sharpened, (3, 3), 0)
-
-            # Append the processed frame
-            frames.append(final_processed)
-
-        # Save as NumPy array
-        frames = np.array(frames, dtype=np.float32) / 255.0  # Normalize pixel values
-        
-        # Pad or truncate to exactly 22 frames
-        REQUIRED_FRAMES = 22
-        if len(frames) < REQUIRED_FRAMES:
-            # Pad by repeating the last frame
-            last_frame = frames[-1] if len(frames) > 0 else np.zeros((80, 112))
-            padding = np.tile(last_frame, (REQUIRED_FRAMES - len(frames), 1, 1))
-            frames = np.vstack([frames, padding])
-        elif len(frames) > REQUIRED_FRAMES:
-            # Truncate to first 22 frames
-            frames = frames[:REQUIRED_FRAMES]
-        
+        # Create output directory for this word
+        word_output_path = os.path.join(OUTPUT_DIR, word)
+        if not os.path.exists(word_output_path):
+            os.makedirs(word_output_path)
+
+        # Queue each take that changed since the last run
+        takes = sorted(os.listdir(word_path))
+
+        for take in takes:
+            take_path = os.path.join(word_path, take)
+            if not os.path.isdir(take_path):
+                continue  # Skip if not a directory
+
+            key = f"{word}/{take}"
+            npy_path = os.path.join(word_output_path, f"{take}.npy")
+            if os.path.normpath(npy_path) in fused:
+                continue  # Written by the fused pipeline (the take dir only holds its debug PNGs)
+            live_takes.add(key)
+            fingerprints[key] = directory_fingerprint(take_path)
+            if is_up_to_date(manifest, key, fingerprints[key], params):
+                skipped += 1
+                continue
+            jobs.append((key, take_path, npy_path))
+
+    num_workers = max(1, min(NUM_WORKERS, len(jobs)))
+    print(f"[INFO] Preprocessing {len(jobs)} takes with {num_workers} worker(s)")
+    start_time = time.time()
+
+    def report(job, result):
+        key, shape = result
+        print(f"  -> Processed take: {key}")
         # Ensure shape is (22, 80, 112)
-        if frames.shape != (REQUIRED_FRAMES, 80, 112):
-            print(f"    [WARNING] Unexpected shape {frames.shape}, expected ({REQUIRED_FRAMES}, 80, 112)")
-        
-        npy_path = os.path.join(word_output_path, f"{take}.npy")
-        np.save(npy_path, frames)
+        if shape != (REQUIRED_FRAMES,) + FRAME_SHAPE:
+            print(f"    [WARNING] Unexpected shape {shape}, expected ({REQUIRED_FRAMES}, 80, 112)")
+        record_build(manifest, key, fingerprints[key], params, [job[2]])
+
+    if num_workers == 1:
+        init_worker()
+        for job in jobs:
+            report(job, process_take(job))
+    else:
+        # imap keeps results (and the log) in the same order as a serial run
+        with Pool(processes=num_workers, initializer=init_worker) as pool:
+            for job, result in zip(jobs, pool.imap(process_take, jobs, chunksize=4)):
+                report(job, result)
+
+    elapsed = time.time() - start_time
+
+    # Samples the fused pipeline has since taken over are forgotten here, never deleted
+    released = [key for key, entry in manifest["entries"].items()
+                if any(absolute_path(path) in fused for path in entry["outputs"])]
+    for key in released:
+        del manifest["entries"][key]
+
+    # Remove samples whose take no longer exists in data/
+    orphans = prune_orphans(manifest, live_takes)
+    for key in orphans:
+        print(f"  -> Removed sample of deleted take: {key}")
+    save_manifest(manifest, MANIFEST_PATH)
+
+    print(f"\n[INFO] {len(jobs)} takes processed in {elapsed:.2f}s, {skipped} up to date, "
+          f"{len(orphans)} orphaned samples removed")
+    print("\n[OK] Preprocessing complete! Processed data saved in 'processed_data/'")
+
 
-print("\n[OK] Preprocessing complete! Processed data saved in 'processed_data/'")
+if __name__ == "__main__":
+    main()
@@ -1,169 +1,631 @@
 import cv2
-import dlib
 import os
 import numpy as np
 import sys
+import time
+import hashlib
+import shutil
+from multiprocessing import Pool
 
 # Get the project root directory (parent of src/)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 sys.path.insert(0, PROJECT_ROOT)
 
-# Load Dlib's face detector and shape predictor
-detector = dlib.get_frontal_face_detector()
-SHAPE_PREDICTOR_PATH = os.path.join(PROJECT_ROOT, "model", "shape_predictor_68_face_landmarks.dat")
-if not os.path.exists(SHAPE_PREDICTOR_PATH):
-    print(f"[ERROR] Shape predictor file not found at {SHAPE_PREDICTOR_PATH}")
-    sys.exit(1)
-predictor = dlib.shape_predictor(SHAPE_PREDICTOR_PATH)
+from src.preprocess import PREPROCESS_PROFILE, SAMPLE_DTYPE, preprocess_frames, frames_to_sample
+from src.build_manifest import (manifest_path, load_manifest, save_manifest, is_up_to_date,
+                                record_build, prune_orphans, replace_output)
 
 # Constants
+SHAPE_PREDICTOR_PATH = os.path.join(PROJECT_ROOT, "model", "shape_predictor_68_face_landmarks.dat")
 VIDEOS_DIR = os.path.join(PROJECT_ROOT, "videos")
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, "data")
+PROCESSED_DIR = os.path.join(PROJECT_ROOT, "processed_data")
 FRAMES_PER_WORD = 22  # Fixed number of frames per take
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+LIP_PADDING = 15  # Pixels added around the lip landmarks before cropping
+LIP_SIZE = (112, 80)  # (width, height) of the saved lip crops
+
+# ==== PARALLEL PROCESSING ====
+# Number of worker processes used to process videos. Each worker loads its own
+# Dlib detector/predictor once. Set to 1 to process videos serially in this process.
+NUM_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+
+# ==== FRAME SAMPLING ====
+# Skipped frames are grabbed without being retrieved. With USE_SEEK, gaps of at least
+# SEEK_MIN_GAP frames are jumped over with a seek instead. Seeks in inter-coded
+# containers (MP4/H.264) restart decoding from the previous keyframe, so they only
+# pay off for long clips with sparse sampling or for intra-only codecs.
+USE_SEEK = False
+SEEK_MIN_GAP = 30
+
+# ==== FUSED PIPELINE ====
+# Run the preprocess.py filter chain on the lip crops in memory and write the final
+# processed_data/<word>/take_N.npy samples directly, skipping the PNG encode/decode
+# round trip through data/. SAVE_PNG_FRAMES additionally dumps the crops for debugging.
+FUSED_PIPELINE = False
+SAVE_PNG_FRAMES = False
+
+# ==== LANDMARK CACHE ====
+# Face boxes and 68-point landmarks of every sampled frame are stored per video in
+# LANDMARK_CACHE_DIR/<content sha256>.npz, so changing LIP_PADDING or LIP_SIZE does
+# not require running Dlib again. RECROP_ONLY rebuilds data/ purely from the cache
+# without loading Dlib at all; frames without cached landmarks are skipped.
+LANDMARK_CACHE_DIR = os.path.join(PROJECT_ROOT, "cache", "landmarks")
+USE_LANDMARK_CACHE = True
+RECROP_ONLY = False
+
+# ==== DEDUPLICATION ====
+# Byte-identical videos (e.g. "morning_01 copy 2.mp4") are processed once; the takes
+# of the duplicates are materialised from the first copy's frames, as hard links
+# when LINK_DUPLICATES is set (falling back to copies where linking is unsupported).
+# Outputs are always replaced, never rewritten in place, so rebuilding the first copy
+# leaves the linked files of its duplicates untouched.
+DEDUPLICATE_VIDEOS = True
+LINK_DUPLICATES = True
+
+# ==== INCREMENTAL BUILDS ====
+# The manifest records each video's content hash, the pipeline parameters and the
+# outputs it was built into. Reruns only process new or changed videos (or all of
+# them after a parameter change) and delete the outputs of videos that were removed.
+MANIFEST_PATH = manifest_path("process_videos")
+FORCE_REBUILD = False
+
+# Dlib's face detector and shape predictor (loaded once per process by init_worker)
+detector = None
+predictor = None
+
+
+def init_worker():
+    """Load Dlib's face detector and shape predictor once per worker process"""
+    global detector, predictor
+    cv2.setNumThreads(1)  # Parallelism comes from the pool, not from OpenCV
+    if RECROP_ONLY:
+        return
+    # Imported here so RECROP_ONLY runs and modules that only need the constants
+    # above (e.g. streaming.py via LIP_SIZE) work without Dlib installed
+    import dlib
+    detector = dlib.get_frontal_face_detector()
+    predictor = dlib.shape_predictor(SHAPE_PREDICTOR_PATH)
+
+
+def iter_sampled_frames(cap, frame_indices, messages=None):
+    """Yield (frame_number, frame, frames_grabbed) for the selected frames only.
+
+    Skipped frames are only grab()bed, so they are never converted to BGR or
+    copied out of the decoder, and decoding stops after the last selected
+    frame. frames_grabbed counts the frames decoded so far, not the ones a
+    seek jumped over. With USE_SEEK enabled, large gaps are skipped with a
+    seek instead; if a seek does not land on the requested frame, the rest of
+    the video is read with sequential grab()s from where the seek left off.
+    """
+    selected = set(int(i) for i in frame_indices)  # O(1) membership per frame
+    if len(selected) == 0:
+        return
+    last_index = max(selected)
+    frame_count = 0
+    frames_grabbed = 0
+    seek = USE_SEEK
+
+    while frame_count <= last_index:
+        if seek and frame_count not in selected:
+            next_index = min(i for i in selected if i > frame_count)
+            if next_index - frame_count >= SEEK_MIN_GAP:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, next_index)
+                # Only trust the seek if the container reports landing on the requested frame;
+                # seeking back would be just as unreliable, so stop seeking in this video
+                position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+                if position != next_index:
+                    seek = False
+                    if messages is not None:
+                        messages.append(f"    [WARNING] Seek to frame {next_index} landed on frame {position}, "
+                                        f"reading the rest of the video sequentially")
+                    if position < 0:
+                        break
+                frame_count = position
+
+        if not cap.grab():
+            break
+        frames_grabbed += 1
+
+        if frame_count in selected:
+            ret, frame = cap.retrieve()
+            if ret:
+                yield frame_count, frame, frames_grabbed
+
+        frame_count += 1
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents, used to key per-video caches"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def landmark_cache_path(video_hash):
+    return os.path.join(LANDMARK_CACHE_DIR, f"{video_hash}.npz")
+
+
+def load_landmark_cache(video_hash):
+    """Load cached detections as {frame_index: (face_box, landmarks)}.
+
+    face_box and landmarks are None for frames where no face was found.
+    """
+    path = landmark_cache_path(video_hash)
+    if not os.path.exists(path):
+        return {}
+    with np.load(path) as cache:
+        return {
+            int(frame_index): (box, points) if found else (None, None)
+            for frame_index, found, box, points in zip(cache["frame_indices"], cache["found"],
+                                                       cache["face_boxes"], cache["landmarks"])
+        }
+
+
+def save_landmark_cache(video_hash, detections):
+    """Write the detections of one video to its .npz sidecar"""
+    os.makedirs(LANDMARK_CACHE_DIR, exist_ok=True)
+    frame_indices = sorted(detections)
+    found = np.array([detections[i][0] is not None for i in frame_indices], dtype=bool)
+    face_boxes = np.zeros((len(frame_indices), 4), dtype=np.int32)
+    landmarks = np.zeros((len(frame_indices), 68, 2), dtype=np.int32)
+    for row, frame_index in enumerate(frame_indices):
+        if found[row]:
+            face_boxes[row], landmarks[row] = detections[frame_index]
+
+    # Write to a temporary file first so concurrent workers never see a partial sidecar
+    path = landmark_cache_path(video_hash)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, frame_indices=np.array(frame_indices, dtype=np.int32),
+                            found=found, face_boxes=face_boxes, landmarks=landmarks)
+    os.replace(tmp_path, path)
+
+
+def detect_landmarks(gray):
+    """Run Dlib on a grayscale frame.
 
-# Ensure output directory exists
-if not os.path.exists(OUTPUT_DIR):
-    os.makedirs(OUTPUT_DIR)
-
-# Check if videos directory exists
-if not os.path.exists(VIDEOS_DIR):
-    print(f"[ERROR] Videos directory not found at {VIDEOS_DIR}")
-    sys.exit(1)
-
-print(f"\nProcessing videos from: {VIDEOS_DIR}")
-print(f"Output directory: {OUTPUT_DIR}\n")
-
-# Get all word folders
-words = sorted([d for d in os.listdir(VIDEOS_DIR) if os.path.isdir(os.path.join(VIDEOS_DIR, d))])
-
-if len(words) == 0:
-    print(f"[ERROR] No word folders found in {VIDEOS_DIR}")
-    sys.exit(1)
-
-print(f"Found {len(words)} words: {', '.join(words)}\n")
-
-# Process each word
-for word in words:
-    word_video_dir = os.path.join(VIDEOS_DIR, word)
-    word_output_dir = os.path.join(OUTPUT_DIR, word)
-    
-    if not os.path.exists(word_output_dir):
-        os.makedirs(word_output_dir)
-    
-    # Get all video files for this word
-    video_files = sorted([f for f in os.listdir(word_video_dir) if f.endswith(('.mp4', '.avi', '.mov', '.mkv'))])
-    
-    if len(video_files) == 0:
-        print(f"[WARNING] No video files found in {word_video_dir}")
-        continue
-    
-    print(f"Processing word: '{word}' ({len(video_files)} videos)")
-    
-    take_number = 1
-    
-    # Process each video
-    for video_file in video_files:
-        video_path = os.path.join(word_video_dir, video_file)
-        take_dir = os.path.join(word_output_dir, f"take_{take_number}")
-        
-        if not os.path.exists(take_dir):
-            os.makedirs(take_dir)
-        
-        print(f"  -> Processing: {video_file}")
-        
-        # Open video
-        cap = cv2.VideoCapture(video_path)
-        
-        if not cap.isOpened():
-            print(f"    [ERROR] Could not open video: {video_path}")
+    Returns the largest face box as [left, top, right, bottom] and its 68
+    landmarks as a (68, 2) array, or (None, None) if no face was found.
+    """
+    # Detect faces
+    faces = detector(gray, 0)
+    if len(faces) == 0:
+        faces = detector(gray, 1)  # Try with upsampling
+
+    if len(faces) == 0:
+        return None, None
+
+    # Use the largest face
+    face = max(faces, key=lambda rect: rect.width() * rect.height())
+    landmarks = predictor(gray, face)
+
+    face_box = np.array([face.left(), face.top(), face.right(), face.bottom()], dtype=np.int32)
+    points = np.array([(landmarks.part(i).x, landmarks.part(i).y) for i in range(68)], dtype=np.int32)
+    return face_box, points
+
+
+def crop_lip_region(frame, landmarks):
+    """Crop and resize the lip region (Dlib landmarks 48-67) from a frame"""
+    lip_points = landmarks[48:68]
+    x_min, y_min = lip_points.min(axis=0)
+    x_max, y_max = lip_points.max(axis=0)
+
+    # Add padding
+    x_min = max(0, x_min - LIP_PADDING)
+    x_max = min(frame.shape[1], x_max + LIP_PADDING)
+    y_min = max(0, y_min - LIP_PADDING)
+    y_max = min(frame.shape[0], y_max + LIP_PADDING)
+
+    # Extract and resize lip region
+    lip_region = frame[y_min:y_max, x_min:x_max]
+    if lip_region.size == 0:
+        return None
+    return cv2.resize(lip_region, LIP_SIZE)
+
+
+def extract_lip_frames(video_path, video_hash, messages, stats):
+    """Extract lip regions from the sampled frames of a video.
+
+    Landmarks are read from the video's cache sidecar when available and Dlib
+    only runs on frames that are not cached yet (never, with RECROP_ONLY).
+    Returns a list of (frame_number, lip_region) tuples and the number of
+    frames decoded from the source video.
+    """
+    cap = cv2.VideoCapture(video_path)
+
+    if not cap.isOpened():
+        messages.append(f"    [ERROR] Could not open video: {video_path}")
+        return None, 0
+
+    # Get video properties
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    # Calculate frame interval to get exactly FRAMES_PER_WORD frames
+    if total_frames < FRAMES_PER_WORD:
+        messages.append(f"    [WARNING] Video has only {total_frames} frames, need {FRAMES_PER_WORD}. Using all frames.")
+        frame_indices = list(range(total_frames))
+    else:
+        frame_indices = np.linspace(0, total_frames - 1, FRAMES_PER_WORD, dtype=int)
+
+    detections = load_landmark_cache(video_hash) if USE_LANDMARK_CACHE else {}
+    cache_updated = False
+
+    frames_collected = []
+    frames_decoded = 0
+
+    for frame_count, frame, frames_decoded in iter_sampled_frames(cap, frame_indices, messages):
+        if frame_count in detections:
+            stats["landmark_hits"] += 1
+        elif RECROP_ONLY:
+            messages.append(f"    [WARNING] No cached landmarks for frame {frame_count}, skipping")
             continue
-        
-        # Get video properties
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
-        # Calculate frame interval to get exactly FRAMES_PER_WORD frames
-        if total_frames < FRAMES_PER_WORD:
-            print(f"    [WARNING] Video has only {total_frames} frames, need {FRAMES_PER_WORD}. Using all frames.")
-            frame_indices = list(range(total_frames))
         else:
-            frame_indices = np.linspace(0, total_frames - 1, FRAMES_PER_WORD, dtype=int)
-        
-        frames_collected = []
-        frame_count = 0
-        
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Check if this frame should be extracted
-            if frame_count in frame_indices:
+            stats["landmark_misses"] += 1
+            try:
                 # Convert to grayscale for face detection
                 gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                
-                # Detect faces
-                faces = detector(gray, 0)
-                if len(faces) == 0:
-                    faces = detector(gray, 1)  # Try with upsampling
-                
-                if len(faces) > 0:
-                    # Use the largest face
-                    face = max(faces, key=lambda rect: rect.width() * rect.height())
-                    
-                    try:
-                        landmarks = predictor(gray, face)
-                        
-                        # Extract lip region (Dlib landmarks 48-67)
-                        lip_points_x = [landmarks.part(i).x for i in range(48, 68)]
-                        lip_points_y = [landmarks.part(i).y for i in range(48, 68)]
-                        
-                        x_min = min(lip_points_x)
-                        x_max = max(lip_points_x)
-                        y_min = min(lip_points_y)
-                        y_max = max(lip_points_y)
-                        
-                        # Add padding
-                        padding = 15
-                        x_min = max(0, x_min - padding)
-                        x_max = min(frame.shape[1], x_max + padding)
-                        y_min = max(0, y_min - padding)
-                        y_max = min(frame.shape[0], y_max + padding)
-                        
-                        # Extract and resize lip region
-                        lip_region = frame[y_min:y_max, x_min:x_max]
-                        
-                        if lip_region.size > 0:
-                            lip_region = cv2.resize(lip_region, (112, 80))
-                            frames_collected.append((frame_count, lip_region))
-                    except Exception as e:
-                        print(f"    [WARNING] Error processing frame {frame_count}: {e}")
-            
-            frame_count += 1
-        
-        cap.release()
-        
-        # Save collected frames
-        if len(frames_collected) >= FRAMES_PER_WORD:
-            # Sort by frame number and take first FRAMES_PER_WORD
-            frames_collected.sort(key=lambda x: x[0])
-            frames_collected = frames_collected[:FRAMES_PER_WORD]
-            
-            for idx, (frame_num, lip_frame) in enumerate(frames_collected):
-                frame_path = os.path.join(take_dir, f"frame_{idx}.png")
-                cv2.imwrite(frame_path, lip_frame)
-            
-            print(f"    [OK] Saved {len(frames_collected)} frames to {take_dir}")
+                detections[frame_count] = detect_landmarks(gray)
+                cache_updated = True
+            except Exception as e:
+                messages.append(f"    [WARNING] Error processing frame {frame_count}: {e}")
+                continue
+
+        face_box, landmarks = detections[frame_count]
+        if landmarks is None:
+            continue
+
+        lip_region = crop_lip_region(frame, landmarks)
+        if lip_region is not None:
+            frames_collected.append((frame_count, lip_region))
+
+    cap.release()
+
+    if USE_LANDMARK_CACHE and cache_updated:
+        save_landmark_cache(video_hash, detections)
+
+    return frames_collected, frames_decoded
+
+
+def select_take_frames(frames_collected, messages):
+    """Order the collected lip frames and keep the first FRAMES_PER_WORD"""
+    if len(frames_collected) >= FRAMES_PER_WORD:
+        # Sort by frame number and take first FRAMES_PER_WORD
+        frames_collected.sort(key=lambda x: x[0])
+        return [lip_frame for frame_num, lip_frame in frames_collected[:FRAMES_PER_WORD]]
+
+    messages.append(f"    [WARNING] Only collected {len(frames_collected)} frames, need {FRAMES_PER_WORD}")
+    # Still save what we have
+    return [lip_frame for frame_num, lip_frame in frames_collected]
+
+
+def save_take(lip_frames, take_dir, messages):
+    """Write the lip frames of one take as PNG files, replacing everything the take held before"""
+    # A rebuild with fewer frames must not leave old frames behind, and the fresh files
+    # also break any hard links shared with duplicate takes
+    if os.path.exists(take_dir):
+        shutil.rmtree(take_dir)
+    os.makedirs(take_dir)
+
+    for idx, lip_frame in enumerate(lip_frames):
+        frame_path = os.path.join(take_dir, f"frame_{idx}.png")
+        cv2.imwrite(frame_path, lip_frame)
+    messages.append(f"    [OK] Saved {len(lip_frames)} frames to {take_dir}")
+
+
+def take_sample_path(take_dir):
+    """Path of the processed_data/ sample that corresponds to a data/ take directory"""
+    word = os.path.basename(os.path.dirname(take_dir))
+    return os.path.join(PROCESSED_DIR, word, f"{os.path.basename(take_dir)}.npy")
+
+
+def save_sample(lip_frames, sample_path, messages):
+    """Preprocess the lip frames in memory and write the final training sample"""
+    sample_dir = os.path.dirname(sample_path)
+    if not os.path.exists(sample_dir):
+        os.makedirs(sample_dir)
+
+    if len(lip_frames) > 0:
+        sample = frames_to_sample(preprocess_frames(np.stack(lip_frames)), SAMPLE_DTYPE)
+    else:
+        sample = frames_to_sample([], SAMPLE_DTYPE)
+    replace_output(sample_path, lambda f: np.save(f, sample))
+    messages.append(f"    [OK] Saved sample {sample.shape} to {sample_path}")
+
+
+def process_video(job):
+    """Process a single video into a take directory.
+
+    Runs inside a worker process; console output is collected in the returned
+    result so the parent can print it without interleaving.
+    """
+    word, video_file, take_dir, video_hash = job
+    video_path = os.path.join(VIDEOS_DIR, word, video_file)
+    messages = []
+    stats = {"landmark_hits": 0, "landmark_misses": 0}
+
+    start_time = time.time()
+    frames_collected, frames_decoded = extract_lip_frames(video_path, video_hash, messages, stats)
+    if frames_collected is not None:
+        lip_frames = select_take_frames(frames_collected, messages)
+        if FUSED_PIPELINE:
+            save_sample(lip_frames, take_sample_path(take_dir), messages)
+        if SAVE_PNG_FRAMES or not FUSED_PIPELINE:
+            save_take(lip_frames, take_dir, messages)
+    elapsed = time.time() - start_time
+
+    return {
+        "word": word,
+        "video_file": video_file,
+        "take_dir": take_dir,
+        "ok": frames_collected is not None,
+        "frames_decoded": frames_decoded,
+        "elapsed": elapsed,
+        "messages": messages,
+        **stats,
+    }
+
+
+def build_jobs(words, manifest):
+    """List (word, video_file, take_dir, video_hash) jobs with deterministic take numbering.
+
+    Videos already in the manifest keep their take number. New videos are
+    numbered after the highest take of their word in sorted filename order, so
+    the output never depends on the order in which workers finish.
+    """
+    jobs = []
+    for word in words:
+        word_video_dir = os.path.join(VIDEOS_DIR, word)
+        word_output_dir = os.path.join(OUTPUT_DIR, word)
+
+        # Get all video files for this word
+        video_files = sorted([f for f in os.listdir(word_video_dir) if f.endswith(VIDEO_EXTENSIONS)])
+
+        if len(video_files) == 0:
+            print(f"[WARNING] No video files found in {word_video_dir}")
+            continue
+
+        print(f"Queued word: '{word}' ({len(video_files)} videos)")
+
+        known_takes = {}
+        for video_file in video_files:
+            entry = manifest["entries"].get(video_key(word, video_file))
+            if entry is not None:
+                known_takes[video_file] = entry["take"]
+        next_take_number = 1 + max([int(take.split("_")[-1]) for take in known_takes.values()], default=0)
+
+        for video_file in video_files:
+            take = known_takes.get(video_file)
+            if take is None:
+                take = f"take_{next_take_number}"
+                next_take_number += 1
+            take_dir = os.path.join(word_output_dir, take)
+            video_hash = file_hash(os.path.join(word_video_dir, video_file))
+            jobs.append((word, video_file, take_dir, video_hash))
+    return jobs
+
+
+def video_key(word, video_file):
+    """Manifest key of a source video"""
+    return f"{word}/{video_file}"
+
+
+def pipeline_params():
+    """Parameters that change the output of a take; editing any of them triggers a rebuild"""
+    return {
+        "frames_per_word": FRAMES_PER_WORD,
+        "lip_padding": LIP_PADDING,
+        "lip_size": LIP_SIZE,
+        "fused_pipeline": FUSED_PIPELINE,
+        "save_png_frames": SAVE_PNG_FRAMES,
+        "preprocess_profile": PREPROCESS_PROFILE,
+        "sample_dtype": SAMPLE_DTYPE,
+    }
+
+
+def job_outputs(job):
+    """Files and directories written for a job in the current output mode"""
+    take_dir = job[2]
+    outputs = []
+    if SAVE_PNG_FRAMES or not FUSED_PIPELINE:
+        outputs.append(take_dir)
+    if FUSED_PIPELINE:
+        outputs.append(take_sample_path(take_dir))
+    return outputs
+
+
+def record_job(manifest, job):
+    word, video_file, take_dir, video_hash = job
+    record_build(manifest, video_key(word, video_file), video_hash, pipeline_params(), job_outputs(job),
+                 take=os.path.basename(take_dir))
+
+
+def split_duplicates(jobs):
+    """Split jobs into unique videos and duplicates of an earlier job.
+
+    Returns the unique jobs and a mapping from each unique take directory to
+    the jobs whose videos have identical content.
+    """
+    unique_jobs = []
+    first_take_by_hash = {}
+    duplicates = {}
+    for job in jobs:
+        take_dir, video_hash = job[2], job[3]
+        if video_hash in first_take_by_hash:
+            duplicates[first_take_by_hash[video_hash]].append(job)
         else:
-            print(f"    [WARNING] Only collected {len(frames_collected)} frames, need {FRAMES_PER_WORD}")
-            # Still save what we have
-            for idx, (frame_num, lip_frame) in enumerate(frames_collected):
-                frame_path = os.path.join(take_dir, f"frame_{idx}.png")
-                cv2.imwrite(frame_path, lip_frame)
-        
-        take_number += 1
+            first_take_by_hash[video_hash] = take_dir
+            duplicates[take_dir] = []
+            unique_jobs.append(job)
+    return unique_jobs, duplicates
+
+
+def link_or_copy(source_path, target_path):
+    """Hard link source_path to target_path, copying when linking is disabled or unsupported"""
+    if os.path.exists(target_path):
+        os.remove(target_path)
+    if LINK_DUPLICATES:
+        try:
+            os.link(source_path, target_path)
+            return
+        except OSError:
+            pass  # e.g. filesystem without hard links
+    shutil.copy2(source_path, target_path)
+
+
+def materialise_duplicate(source_take_dir, take_dir):
+    """Fill a duplicate's outputs with those of the processed copy"""
+    if os.path.isdir(source_take_dir) and (SAVE_PNG_FRAMES or not FUSED_PIPELINE):
+        if os.path.exists(take_dir):
+            shutil.rmtree(take_dir)  # Drop frames the source take no longer has
+        os.makedirs(take_dir)
+        for frame_file in sorted(os.listdir(source_take_dir)):
+            link_or_copy(os.path.join(source_take_dir, frame_file), os.path.join(take_dir, frame_file))
+
+    if FUSED_PIPELINE:
+        sample_path = take_sample_path(take_dir)
+        sample_dir = os.path.dirname(sample_path)
+        if not os.path.exists(sample_dir):
+            os.makedirs(sample_dir)
+        link_or_copy(take_sample_path(source_take_dir), sample_path)
+
+
+def main():
+    if not RECROP_ONLY and not os.path.exists(SHAPE_PREDICTOR_PATH):
+        print(f"[ERROR] Shape predictor file not found at {SHAPE_PREDICTOR_PATH}")
+        sys.exit(1)
+
+    # Ensure output directory exists
+    if not os.path.exists(OUTPUT_DIR):
+        os.makedirs(OUTPUT_DIR)
+
+    # Check if videos directory exists
+    if not os.path.exists(VIDEOS_DIR):
+        print(f"[ERROR] Videos directory not found at {VIDEOS_DIR}")
+        sys.exit(1)
+
+    print(f"\nProcessing videos from: {VIDEOS_DIR}")
+    print(f"Output directory: {OUTPUT_DIR}\n")
+
+    # Get all word folders
+    words = sorted([d for d in os.listdir(VIDEOS_DIR) if os.path.isdir(os.path.join(VIDEOS_DIR, d))])
+
+    if len(words) == 0:
+        print(f"[ERROR] No word folders found in {VIDEOS_DIR}")
+        sys.exit(1)
+
+    print(f"Found {len(words)} words: {', '.join(words)}\n")
+
+    manifest = {"entries": {}} if FORCE_REBUILD else load_manifest(MANIFEST_PATH)
+    jobs = build_jobs(words, manifest)
+
+    # Delete the outputs of videos that no longer exist before their take numbers are reused
+    orphans = prune_orphans(manifest, {video_key(job[0], job[1]) for job in jobs})
+    for key in orphans:
+        print(f"[INFO] Removed outputs of deleted video: {key}")
+
+    params = pipeline_params()
+    stale = {job[2] for job in jobs
+             if not is_up_to_date(manifest, video_key(job[0], job[1]), job[3], params)}
+
+    if DEDUPLICATE_VIDEOS:
+        unique_jobs, duplicates = split_duplicates(jobs)
+        print(f"\n[INFO] Deduplication: {len(jobs)} videos, {len(unique_jobs)} unique, "
+              f"{len(jobs) - len(unique_jobs)} duplicates")
+    else:
+        unique_jobs, duplicates = jobs, {job[2]: [] for job in jobs}
+
+    # Duplicates of an up-to-date video are filled from its existing outputs right away
+    duplicates_reused = 0
+    for job in unique_jobs:
+        if job[2] in stale:
+            continue
+        for duplicate_job in duplicates[job[2]]:
+            if duplicate_job[2] in stale:
+                materialise_duplicate(job[2], duplicate_job[2])
+                record_job(manifest, duplicate_job)
+                duplicates_reused += 1
+
+    pending_jobs = [job for job in unique_jobs if job[2] in stale]
+    print(f"[INFO] Incremental build: {len(jobs) - len(stale)} takes up to date, "
+          f"{len(stale)} to build, {len(orphans)} orphaned removed")
+
+    num_workers = max(1, min(NUM_WORKERS, len(pending_jobs)))
+    print(f"\n[INFO] Processing {len(pending_jobs)} videos with {num_workers} worker(s)\n")
+
+    results = []
+    duplicate_results = []  # The processed result each materialised duplicate was taken from
+    start_time = time.time()
+
+    def report(result):
+        fps = result["frames_decoded"] / result["elapsed"] if result["elapsed"] > 0 else 0.0
+        print(f"  -> [{result['word']}] {result['video_file']} "
+              f"({result['frames_decoded']} frames decoded, {result['elapsed']:.2f}s, {fps:.1f} frames/sec)")
+        for message in result["messages"]:
+            print(message)
+        results.append(result)
+
+        key = video_key(result["word"], result["video_file"])
+        if not result["ok"]:
+            manifest["entries"].pop(key, None)
+            return
+        record_job(manifest, jobs_by_take[result["take_dir"]])
+
+        for duplicate_job in duplicates[result["take_dir"]]:
+            if duplicate_job[2] in stale:
+                materialise_duplicate(result["take_dir"], duplicate_job[2])
+                record_job(manifest, duplicate_job)
+                print(f"  -> [{duplicate_job[0]}] {duplicate_job[1]} (duplicate of {result['video_file']}, "
+                      f"saved to {duplicate_job[2]})")
+                duplicate_results.append(result)
+
+    jobs_by_take = {job[2]: job for job in jobs}
+
+    if len(pending_jobs) == 0:
+        print("[OK] All takes are up to date")
+    elif num_workers == 1:
+        init_worker()
+        for job in pending_jobs:
+            report(process_video(job))
+    else:
+        with Pool(processes=num_workers, initializer=init_worker) as pool:
+            for result in pool.imap_unordered(process_video, pending_jobs):
+                report(result)
+
+    wall_time = time.time() - start_time
+    save_manifest(manifest, MANIFEST_PATH)
+
+    # ==== SUMMARY ====
+    total_frames = sum(r["frames_decoded"] for r in results)
+    cpu_time = sum(r["elapsed"] for r in results)
+    failed = [r for r in results if not r["ok"]]
+    print(f"\n[INFO] Processed {len(results) - len(failed)}/{len(results)} videos in {wall_time:.2f}s")
+    if results and wall_time > 0:
+        print(f"[INFO] Aggregate throughput: {total_frames / wall_time:.1f} frames/sec "
+              f"({total_frames} frames decoded, {num_workers} worker(s))")
+        print(f"[INFO] Parallel speedup over summed per-video time: {cpu_time / wall_time:.2f}x")
+    landmark_hits = sum(r["landmark_hits"] for r in results)
+    landmark_misses = sum(r["landmark_misses"] for r in results)
+    if landmark_hits + landmark_misses > 0:
+        print(f"[INFO] Landmark cache: {landmark_hits} frames reused, {landmark_misses} frames run through Dlib")
+    if duplicate_results:
+        saved_frames = sum(r["frames_decoded"] for r in duplicate_results)
+        saved_time = sum(r["elapsed"] for r in duplicate_results)
+        print(f"[INFO] Deduplication: {len(duplicate_results)} duplicate takes materialised, "
+              f"avoiding {saved_frames} decoded frames (~{saved_time:.2f}s of processing)")
+    if duplicates_reused:
+        print(f"[INFO] Deduplication: {duplicates_reused} duplicate takes materialised from up-to-date takes")
+
+    if FUSED_PIPELINE:
+        print(f"\n[OK] Video processing complete! Samples saved in '{PROCESSED_DIR}'")
+        print(f"Next step: Run 'python src/train_model.py' to train the model")
+    else:
+        print(f"\n[OK] Video processing complete! Data saved in '{OUTPUT_DIR}'")
+        print(f"Next step: Run 'python src/preprocess.py' to preprocess the data")
 
-print(f"\n[OK] Video processing complete! Data saved in '{OUTPUT_DIR}'")
-print(f"Next step: Run 'python src/preprocess.py' to preprocess the data")
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import gzip
+import os
+import numpy as np
+import sys
+import tensorflow as tf
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.compare_architectures import measure_latency
+from src.dataset import open_store
+from src.inference import MODEL_PATHS
+from src.train_model import INPUT_SHAPE, prepare_datasets, build_3d_cnn, compile_model, training_callbacks
+
+# ==== PRUNING SETTINGS ====
+# The weakest PRUNE_FRACTION of every Conv3D layer's filters (by L1 norm) are removed, so the
+# result is a genuinely smaller model; it is fine-tuned and saved as lip_reader_3dcnn_pruned.h5.
+PRUNE_FRACTION = 0.5  # Share of the filters removed from every Conv3D layer
+FINETUNE_EPOCHS = 40  # Fine-tuning epochs after pruning (early stopping may end sooner)
+FINETUNE_LEARNING_RATE = 0.0002
+CLUSTER_WEIGHTS = True  # Share weights within each layer after fine-tuning (smaller compressed model)
+CLUSTER_COUNT = 16  # Distinct weight values per Conv3D/Dense kernel when clustering
+SEED = 42
+
+
+def rank_filters(model):
+    """Sorted indices of the filters kept in each Conv3D layer (those with the largest L1 norm)"""
+    keeps = []
+    for layer in model.layers:
+        if isinstance(layer, tf.keras.layers.Conv3D):
+            norms = np.abs(layer.get_weights()[0]).sum(axis=(0, 1, 2, 3))
+            num_keep = max(1, int(round(len(norms) * (1 - PRUNE_FRACTION))))
+            keeps.append(np.sort(np.argsort(norms)[::-1][:num_keep]))
+    return keeps
+
+
+def prune_filters(model, num_classes):
+    """Build a build_3d_cnn with fewer filters and copy the surviving weights into it"""
+    keeps = rank_filters(model)
+    dense_units = tuple(layer.units for layer in model.layers if isinstance(layer, tf.keras.layers.Dense))[:-1]
+    if len(keeps) != 3 or len(dense_units) != 2:
+        print("[ERROR] Structured pruning supports the conv3d architecture of build_3d_cnn only.")
+        sys.exit(1)
+    pruned = build_3d_cnn(INPUT_SHAPE, num_classes, filters=tuple(len(keep) for keep in keeps),
+                          dense_units=dense_units, architecture="conv3d")
+    if [type(layer) for layer in pruned.layers] != [type(layer) for layer in model.layers]:
+        print("[ERROR] Structured pruning supports the conv3d architecture of build_3d_cnn only.")
+        sys.exit(1)
+
+    conv_keeps = iter(keeps)
+    channels = None  # Surviving channels of the most recent Conv3D, until the first Dense consumes them
+    for source, target in zip(model.layers, pruned.layers):
+        weights = source.get_weights()
+        if isinstance(source, tf.keras.layers.Conv3D):
+            keep = next(conv_keeps)
+            kernel = weights[0][..., keep]
+            if channels is not None:
+                kernel = kernel[:, :, :, channels, :]
+            weights = [kernel, weights[1][keep]]
+            channels = keep
+        elif isinstance(source, tf.keras.layers.BatchNormalization) and channels is not None:
+            weights = [w[channels] for w in weights]  # gamma, beta, moving mean, moving variance
+        elif isinstance(source, tf.keras.layers.Dense) and channels is not None:
+            weights = [weights[0][channels], weights[1]]
+            channels = None
+        target.set_weights(weights)
+    return pruned
+
+
+def cluster_weights(model):
+    """Replace every Conv3D/Dense kernel by CLUSTER_COUNT shared values (1-D k-means)"""
+    for layer in model.layers:
+        if not isinstance(layer, (tf.keras.layers.Conv3D, tf.keras.layers.Dense)):
+            continue
+        weights = layer.get_weights()
+        kernel = weights[0].ravel()
+        centroids = np.linspace(kernel.min(), kernel.max(), CLUSTER_COUNT)  # Linear init, as in Han et al.
+        for _ in range(20):
+            assignment = np.abs(kernel[:, np.newaxis] - centroids).argmin(axis=1)
+            for c in range(CLUSTER_COUNT):
+                members = kernel[assignment == c]
+                if len(members) > 0:
+                    centroids[c] = members.mean()
+        weights[0] = centroids[assignment].reshape(weights[0].shape).astype(weights[0].dtype)
+        layer.set_weights(weights)
+
+
+def model_sizes(path):
+    """Size of a saved model on disk and gzip-compressed (where weight clustering pays off)"""
+    with open(path, "rb") as f:
+        data = f.read()
+    return len(data), len(gzip.compress(data))
+
+
+def main():
+    original_path = MODEL_PATHS["keras"]
+    pruned_path = MODEL_PATHS["keras_pruned"]
+    if not os.path.exists(original_path):
+        print(f"[ERROR] Model not found at {original_path}. Please run train_model.py first.")
+        sys.exit(1)
+    model = tf.keras.models.load_model(original_path)
+
+    store = open_store()
+    num_classes = len(store.words)
+    train_dataset, val_dataset, _ = prepare_datasets(store, np.arange(len(store)), store.labels, num_classes, SEED)
+
+    compile_model(model)
+    results = {"original": (model.count_params(), model_sizes(original_path), measure_latency(model),
+                            model.evaluate(val_dataset, verbose=0)[1])}
+
+    pruned = compile_model(prune_filters(model, num_classes), learning_rate=FINETUNE_LEARNING_RATE)
+    print(f"\n[INFO] Pruned {PRUNE_FRACTION * 100:.0f}% of the Conv3D filters: "
+          f"{model.count_params():,} -> {pruned.count_params():,} parameters")
+    print(f"[INFO] Accuracy right after pruning: {pruned.evaluate(val_dataset, verbose=0)[1] * 100:.2f}%")
+    print(f"\nFine-tuning for up to {FINETUNE_EPOCHS} epochs...\n")
+    pruned.fit(train_dataset, epochs=FINETUNE_EPOCHS, validation_data=val_dataset, callbacks=training_callbacks(),
+               verbose=1)
+
+    if CLUSTER_WEIGHTS:
+        cluster_weights(pruned)
+        print(f"[INFO] Clustered every kernel to {CLUSTER_COUNT} shared values")
+
+    pruned.save(pruned_path)
+    print(f"\n[OK] Pruned model saved to {pruned_path}")
+    results["pruned"] = (pruned.count_params(), model_sizes(pruned_path), measure_latency(pruned),
+                         pruned.evaluate(val_dataset, verbose=0)[1])
+
+    # ==== REPORT ====
+    print("\n" + "=" * 74)
+    print(f"{'Model':10s} {'Params':>10s} {'Size':>10s} {'Gzipped':>10s} {'CPU ms':>9s} {'Val accuracy':>14s}")
+    print("=" * 74)
+    for name, (params, (size, compressed), latency, accuracy) in results.items():
+        print(f"{name:10s} {params:10,d} {size / 1024:7.0f} KB {compressed / 1024:7.0f} KB {latency:9.2f} "
+              f"{accuracy * 100:13.2f}%")
+    print("=" * 74)
+    print("Set INFERENCE_BACKEND = \"keras_pruned\" in src/inference.py to use the pruned model.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import cv2
+import os
+import numpy as np
+import sys
+import threading
+import time
+from collections import deque
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.dataset import PROCESSED_DATA_DIR, list_words
+from src.inference import INFERENCE_BACKEND, load_classifier
+from src.preprocess import REQUIRED_FRAMES, FRAME_SHAPE, PREPROCESS_PROFILE, BatchPreprocessor
+from src.process_videos import LIP_SIZE
+
+# ==== STREAMING SETTINGS ====
+WINDOW_FRAMES = REQUIRED_FRAMES  # Frames per model input, as in training
+
+# ==== EARLY EXIT ====
+# With a threshold set (and INFERENCE_BACKEND = "keras_early_exit", see early_exit.py), a
+# prediction is also made after EARLY_EXIT_FRAMES frames, padded like a short take, and
+# published as soon as its confidence (percent) reaches the threshold
+EARLY_EXIT_FRAMES = (11, 16)
+EARLY_EXIT_THRESHOLD = None
+
+# ==== CONTINUOUS WORD SPOTTING ====
+# With CONTINUOUS_RECOGNITION, overlapping windows are classified every WINDOW_STRIDE
+# frames and merged into word events instead of classifying only the newest window
+CONTINUOUS_RECOGNITION = False
+WINDOW_STRIDE = 4  # Frames between the starts of consecutive windows
+MAX_BATCH_WINDOWS = 8  # Pending windows evaluated together in one model call when inference falls behind
+HISTORY_FRAMES = WINDOW_FRAMES + WINDOW_STRIDE * MAX_BATCH_WINDOWS  # Frames kept for pending windows
+SPOT_THRESHOLD = 80.0  # Minimum window confidence (percent) to become a word candidate
+NMS_IOU = 0.3  # Events of different words overlapping a stronger one by more than this are suppressed
+
+
+class FrameBuffer:
+    """Ring buffer of the last `size` preprocessed lip crops, as float32 in [0, 1].
+
+    With raw set it holds the unprocessed uint8 BGR crops instead, for the
+    serving backends that preprocess inside the model.
+    """
+
+    def __init__(self, size=WINDOW_FRAMES, raw=False):
+        self.raw = raw
+        if raw:
+            self.frames = np.zeros((size,) + FRAME_SHAPE + (3,), dtype=np.uint8)
+        else:
+            self.frames = np.zeros((size,) + FRAME_SHAPE, dtype=np.float32)
+        self.count = 0  # Frames pushed since the last reset
+
+    def push(self, frame):
+        if self.raw:
+            self.frames[self.count % len(self.frames)] = frame
+        else:
+            np.divide(frame, np.float32(255.0), out=self.frames[self.count % len(self.frames)], dtype=np.float32)
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+    def has_window(self):
+        return self.count >= WINDOW_FRAMES
+
+    def prefix(self):
+        """The frames pushed so far (fewer than a window), padded by repeating the newest one"""
+        return self.frames[np.minimum(np.arange(WINDOW_FRAMES), self.count - 1)]
+
+    def window(self, end=None):
+        """Copy of the WINDOW_FRAMES frames before frame number end (default: the newest), oldest first"""
+        end = self.count if end is None else end
+        return self.frames[np.arange(end - WINDOW_FRAMES, end) % len(self.frames)]
+
+
+class StreamingRecognizer:
+    """Runs the word classifier on the live stream of lip crops.
+
+    The camera loop calls push_frame() with every frame and the lip box found
+    by the existing Dlib code. Only the new crop is preprocessed (every
+    preprocessing step works per frame, so the buffered frames never need to be
+    recomputed) and stored in a ring buffer. A worker thread runs the model on
+    the newest full window whenever one is available, skipping windows it did
+    not get to, so the camera loop never waits for inference. Each prediction
+    is passed to on_prediction(word, confidence), with the softmax confidence
+    in percent as the UI expects. With EARLY_EXIT_THRESHOLD set, padded prefixes
+    are also classified after EARLY_EXIT_FRAMES frames and published only when
+    confident enough. With a serving backend (see inference.RAW_INPUT_BACKENDS)
+    the crops are buffered raw and preprocessed by the model itself.
+    """
+
+    def __init__(self, on_prediction, backend=INFERENCE_BACKEND, words=None, profile=PREPROCESS_PROFILE):
+        self.on_prediction = on_prediction
+        self.classifier = load_classifier(backend)
+        self.words = words or list_words(PROCESSED_DATA_DIR)
+        if len(self.words) != self.classifier.num_classes:
+            raise ValueError(f"Model predicts {self.classifier.num_classes} words but {len(self.words)} were given")
+        self.preprocessor = None if self.classifier.raw_input else BatchPreprocessor(profile)
+        self.buffer = FrameBuffer(raw=self.classifier.raw_input)
+        self.condition = threading.Condition()
+        self.pending = False  # A window newer than the last prediction is available
+        self.running = False
+        self.thread = None
+        self.inference_ms = 0.0  # Latency of the last model call
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+
+    def preprocess_crop(self, frame, lip_box, mirrored):
+        """Crop, resize and preprocess the lip region of one frame (None if the box is empty).
+
+        The crop is returned unprocessed for a serving backend, whose model preprocesses it.
+        """
+        x_min, y_min, x_max, y_max = lip_box
+        lip_region = frame[y_min:y_max, x_min:x_max]
+        if lip_region.size == 0:
+            return None
+        if mirrored:
+            lip_region = cv2.flip(lip_region, 1)  # Training crops come from unmirrored video
+        crop = cv2.resize(lip_region, LIP_SIZE)
+        if self.preprocessor is None:
+            return crop
+        return self.preprocessor(crop[np.newaxis])[0]
+
+    def classify(self, windows):
+        """Softmax probabilities of a (N, WINDOW_FRAMES, ...) stack of buffered windows"""
+        return self.classifier.predict(windows if self.buffer.raw else windows[..., np.newaxis])
+
+    def push_frame(self, frame, lip_box, mirrored=True):
+        """Add the lip crop of a BGR camera frame; lip_box is (x_min, y_min, x_max, y_max)"""
+        processed = self.preprocess_crop(frame, lip_box, mirrored)
+        if processed is None:
+            return
+        with self.condition:
+            self.buffer.push(processed)
+            early_exit = EARLY_EXIT_THRESHOLD is not None and self.buffer.count in EARLY_EXIT_FRAMES
+            if self.buffer.has_window() or early_exit:
+                self.pending = True
+                self.condition.notify()
+
+    def reset(self):
+        """Forget the buffered frames, e.g. when the face is lost, so windows stay contiguous"""
+        with self.condition:
+            self.buffer.reset()
+            self.pending = False
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                partial = not self.buffer.has_window()
+                window = self.buffer.prefix() if partial else self.buffer.window()
+                self.pending = False
+
+            start_time = time.perf_counter()
+            probabilities = self.classify(window[np.newaxis])[0]
+            self.inference_ms = (time.perf_counter() - start_time) * 1000
+            best = int(np.argmax(probabilities))
+            confidence = float(probabilities[best]) * 100
+            if partial and confidence < EARLY_EXIT_THRESHOLD:
+                continue  # Not confident yet; wait for more frames
+            self.on_prediction(self.words[best], confidence)
+
+
+class ContinuousWordSpotter(StreamingRecognizer):
+    """Spots words in a continuous stream with overlapping sliding windows.
+
+    A window is scheduled every WINDOW_STRIDE frames. The worker takes every
+    pending window (up to MAX_BATCH_WINDOWS) in one model call, so when
+    inference falls behind it catches up in batches instead of running one
+    forward pass per frame. Windows whose best word reaches SPOT_THRESHOLD
+    become candidates. Once no later window can overlap them, overlapping
+    candidates of the same word are merged into one event, competing events
+    of different words go through non-maximum suppression, and each surviving
+    event is reported once through on_prediction(word, confidence).
+    """
+
+    def __init__(self, on_prediction, stride=WINDOW_STRIDE, **kwargs):
+        super().__init__(on_prediction, **kwargs)
+        self.stride = stride
+        self.buffer = FrameBuffer(HISTORY_FRAMES, raw=self.classifier.raw_input)
+        self.windows = deque()  # End frame numbers of pending windows; None marks a reset
+        self.segment_start = 0  # Frame number of the first frame since the face was last found
+        self.candidates = []  # (start, end, class, confidence) of windows above the threshold
+        self.model_calls = 0
+        self.windows_evaluated = 0
+        self.windows_dropped = 0
+
+    def push_frame(self, frame, lip_box, mirrored=True):
+        processed = self.preprocess_crop(frame, lip_box, mirrored)
+        if processed is None:
+            return
+        with self.condition:
+            self.buffer.push(processed)
+            end = self.buffer.count
+            if end - self.segment_start >= WINDOW_FRAMES and (end - self.segment_start - WINDOW_FRAMES) % self.stride == 0:
+                self.windows.append(end)
+                self.condition.notify()
+            # Windows whose oldest frames were already overwritten can no longer be evaluated
+            while self.windows and self.windows[0] is not None and \
+                    self.windows[0] < end - len(self.buffer.frames) + WINDOW_FRAMES:
+                self.windows.popleft()
+                self.windows_dropped += 1
+
+    def reset(self):
+        """Start a new segment; windows never span frames from both sides of a reset"""
+        with self.condition:
+            if self.segment_start == self.buffer.count:
+                return  # Nothing pushed since the last reset (the face is still lost)
+            self.segment_start = self.buffer.count
+            self.windows.append(None)
+            self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.windows:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                ends, flush = [], False
+                while self.windows and len(ends) < MAX_BATCH_WINDOWS:
+                    end = self.windows.popleft()
+                    if end is None:
+                        flush = True
+                        break
+                    ends.append(end)
+                batch = np.stack([self.buffer.window(end) for end in ends]) if ends else None
+
+            horizon = None
+            if batch is not None:
+                start_time = time.perf_counter()
+                probabilities = self.classify(batch)
+                self.inference_ms = (time.perf_counter() - start_time) * 1000
+                self.model_calls += 1
+                self.windows_evaluated += len(ends)
+                for end, window_probabilities in zip(ends, probabilities):
+                    best = int(np.argmax(window_probabilities))
+                    confidence = float(window_probabilities[best]) * 100
+                    if confidence >= SPOT_THRESHOLD:
+                        self.candidates.append((end - WINDOW_FRAMES, end, best, confidence))
+                horizon = ends[-1] - WINDOW_FRAMES  # Later windows all start at or after this frame
+
+            for _, _, best, confidence in self.close_candidates(None if flush else horizon):
+                self.on_prediction(self.words[best], confidence)
+
+    def close_candidates(self, horizon):
+        """Merge and return the candidates that no later window can overlap, in time order.
+
+        Overlapping candidates form a cluster; a cluster is closed once it ends
+        at or before horizon (or always, if horizon is None). Within a closed
+        cluster, chains of overlapping candidates of the same word become one
+        event spanning them, with their best confidence, so a word held over
+        many strided windows is reported once. Greedy non-maximum suppression
+        then keeps the strongest events that do not overlap each other.
+        """
+        clusters = []
+        for candidate in sorted(self.candidates):
+            if clusters and candidate[0] < max(c[1] for c in clusters[-1]):
+                clusters[-1].append(candidate)
+            else:
+                clusters.append([candidate])
+
+        events, remaining = [], []
+        for cluster in clusters:
+            if horizon is not None and max(c[1] for c in cluster) > horizon:
+                remaining += cluster
+                continue
+            merged = []
+            for word in {c[2] for c in cluster}:
+                for start, end, _, confidence in sorted(c for c in cluster if c[2] == word):
+                    if merged and merged[-1][2] == word and start < merged[-1][1]:
+                        merged[-1] = (merged[-1][0], max(end, merged[-1][1]), word, max(confidence, merged[-1][3]))
+                    else:
+                        merged.append((start, end, word, confidence))
+            kept = []
+            for event in sorted(merged, key=lambda c: c[3], reverse=True):
+                if all(window_iou(event, other) <= NMS_IOU for other in kept):
+                    kept.append(event)
+            events += kept
+        self.candidates = remaining
+        return sorted(events)
+
+
+def window_iou(a, b):
+    """Intersection over union of two (start, end, ...) frame intervals"""
+    intersection = max(0, min(a[1], b[1]) - max(a[0], b[0]))
+    return intersection / (max(a[1], b[1]) - min(a[0], b[0]))
+
+
+def create_recognizer(on_prediction):
+    """The live recognizer selected by CONTINUOUS_RECOGNITION"""
+    if CONTINUOUS_RECOGNITION:
+        return ContinuousWordSpotter(on_prediction)
+    return StreamingRecognizer(on_prediction)
@@ -0,0 +1,175 @@
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import numpy as np
+import sys
+import time
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src import worker_pool
+from src.build_manifest import MANIFEST_DIR
+from src.dataset import open_store
+
+# ==== SEARCH SPACE ====
+# Every combination of these values is one trial
+SEARCH_SPACE = {
+    "learning_rate": [0.0005, 0.001],
+    "batch_size": [8, 16],
+    "conv_filters": [(16, 32, 64), (8, 16, 32)],
+    "dense_units": [(128, 64), (64, 32)],
+}
+SWEEP_EPOCHS = 100  # Training epochs per trial (early stopping may end sooner)
+
+# ==== SWEEP SETTINGS ====
+# Results are cached under cache/sweep/ per trial config and dataset; trials falling clearly
+# behind the best finished one are pruned early.
+NUM_WORKERS = None  # Trials trained at once; None = CPU count // 2
+PRUNE_AFTER_EPOCHS = 15  # Trials are never pruned before this epoch
+PRUNE_RATIO = 0.6  # Prune when a trial's best val accuracy < PRUNE_RATIO x best finished trial
+TRIAL_CACHE_DIR = os.path.join(MANIFEST_DIR, "sweep")
+SEED = 42
+
+
+def trial_configs():
+    """Expand SEARCH_SPACE into a list of trial configs"""
+    names = sorted(SEARCH_SPACE)
+    return [dict(zip(names, values)) for values in itertools.product(*(SEARCH_SPACE[name] for name in names))]
+
+
+def trial_key(config, fingerprint):
+    """Hash of a trial config together with the dataset and the train_model.py settings it is trained with"""
+    from src.train_model import MODEL_ARCHITECTURE, TRAIN_AUGMENTATIONS
+
+    payload = json.dumps({"config": config, "epochs": SWEEP_EPOCHS, "seed": SEED, "data": fingerprint,
+                          "architecture": MODEL_ARCHITECTURE, "augmentations": TRAIN_AUGMENTATIONS}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def trial_cache_path(key):
+    return os.path.join(TRIAL_CACHE_DIR, f"{key}.json")
+
+
+def load_trial(key):
+    path = trial_cache_path(key)
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return None
+
+
+def save_trial(key, result):
+    """Write a trial result atomically"""
+    os.makedirs(TRIAL_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{trial_cache_path(key)}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(result, f, indent=1)
+    os.replace(tmp_path, trial_cache_path(key))
+
+
+def pruning_callback(stats):
+    """Keras callback stopping a trial that falls clearly behind the best finished trial"""
+    import tensorflow as tf
+
+    class PruneTrial(tf.keras.callbacks.Callback):
+        def on_epoch_end(self, epoch, logs=None):
+            stats["best"] = max(stats["best"], logs.get("val_accuracy", 0.0))
+            if epoch + 1 >= PRUNE_AFTER_EPOCHS and stats["best"] < PRUNE_RATIO * worker_pool.shared.value:
+                stats["pruned"] = True
+                self.model.stop_training = True
+
+    return PruneTrial()
+
+
+def run_trial(job):
+    """Train one trial config and return its result"""
+    from src.train_model import INPUT_SHAPE, prepare_datasets, build_3d_cnn, compile_model, training_callbacks
+
+    key, config = job
+    store = worker_pool.store
+    num_classes = len(store.words)
+    start_time = time.perf_counter()
+
+    # Every trial sees the same split, initialisation and augmentations
+    train_dataset, val_dataset, _ = prepare_datasets(store, np.arange(len(store)), store.labels, num_classes, SEED,
+                                                     batch_size=config["batch_size"])
+
+    model = compile_model(build_3d_cnn(INPUT_SHAPE, num_classes, filters=config["conv_filters"],
+                                       dense_units=config["dense_units"]), learning_rate=config["learning_rate"])
+    stats = {"best": 0.0, "pruned": False}
+    history = model.fit(train_dataset, epochs=SWEEP_EPOCHS, validation_data=val_dataset,
+                        callbacks=training_callbacks() + [pruning_callback(stats)], verbose=0)
+
+    accuracy = stats["best"]
+    if not stats["pruned"]:
+        _, accuracy, _, _ = model.evaluate(val_dataset, verbose=0)
+        with worker_pool.shared.get_lock():
+            worker_pool.shared.value = max(worker_pool.shared.value, accuracy)
+
+    return key, {
+        "config": config,
+        "val_accuracy": float(accuracy),
+        "epochs": len(history.history["loss"]),
+        "pruned": stats["pruned"],
+        "params": model.count_params(),
+        "elapsed": time.perf_counter() - start_time,
+    }
+
+
+def main():
+    store = open_store()  # Build the store once here so workers only open it
+    fingerprint = store.fingerprint
+
+    configs = trial_configs()
+    results = {}
+    jobs = []
+    for config in configs:
+        # JSON round-trip so tuples in SEARCH_SPACE hash and compare like cached lists
+        config = json.loads(json.dumps(config))
+        key = trial_key(config, fingerprint)
+        cached = load_trial(key)
+        if cached is not None:
+            results[key] = dict(cached, cached=True)
+        else:
+            jobs.append((key, config))
+
+    print(f"\n[INFO] {len(configs)} trials in the search space: {len(results)} cached, {len(jobs)} to run")
+
+    if jobs:
+        num_workers = min(len(jobs), NUM_WORKERS or max(1, (os.cpu_count() or 1) // 2))
+        threads = max(1, (os.cpu_count() or 1) // num_workers)
+        print(f"[INFO] {num_workers} worker(s) x {threads} TensorFlow thread(s)\n")
+
+        # Cached finished trials on the same data already set the bar for pruning
+        ctx = multiprocessing.get_context("spawn")  # TensorFlow is not fork-safe
+        shared_best = ctx.Value("d", max([r["val_accuracy"] for r in results.values() if not r["pruned"]], default=0.0))
+        with ctx.Pool(num_workers, initializer=worker_pool.init_worker, initargs=(threads, shared_best)) as pool:
+            for i, (key, result) in enumerate(pool.imap_unordered(run_trial, jobs), 1):
+                save_trial(key, result)
+                results[key] = dict(result, cached=False)
+                status = "pruned" if result["pruned"] else "done"
+                print(f"[OK] Trial {i}/{len(jobs)} {status}: val accuracy {result['val_accuracy'] * 100:.2f}% "
+                      f"after {result['epochs']} epochs ({result['elapsed']:.0f}s) {result['config']}")
+
+    # ==== REPORT ====
+    ranked = sorted(results.values(), key=lambda r: (not r["pruned"], r["val_accuracy"]), reverse=True)
+    print("\n" + "=" * 96)
+    print(f"{'Val acc':>8s} {'Epochs':>7s} {'Params':>9s} {'Status':>8s}  Config")
+    print("=" * 96)
+    for result in ranked:
+        status = "pruned" if result["pruned"] else ("cached" if result["cached"] else "new")
+        print(f"{result['val_accuracy'] * 100:7.2f}% {result['epochs']:7d} {result['params']:9,d} {status:>8s}  "
+              f"{result['config']}")
+    print("=" * 96)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import os
+import sys
+
+# Get the project root directory (parent of src/)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.dataset import open_store
+
+# ==== WORKER STATE ====
+# cross_validate.py and sweep.py train in spawned pools (TensorFlow is not fork-safe);
+# init_worker bounds TensorFlow's threads and opens the dataset store once per worker.
+store = None
+threads = None  # TensorFlow intra-op threads of this worker
+shared = None  # Optional object shared by all workers, e.g. a multiprocessing.Value
+
+
+def init_worker(num_threads, shared_value=None):
+    """Bound TensorFlow's thread pools before it starts, then open the dataset store"""
+    global store, threads, shared
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(max(1, num_threads // 2))
+    store = open_store()
+    threads = num_threads
+    shared = shared_value
@@ -1,5 +1,4 @@
 import numpy as np
-import tensorflow as tf
 import os
 import sys
 
@@ -7,38 +6,26 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = SCRIPT_DIR
 sys.path.insert(0, PROJECT_ROOT)
 
-# Load model
-MODEL_PATH = os.path.join(PROJECT_ROOT, "model", "lip_reader_3dcnn.h5")
-model = tf.keras.models.load_model(MODEL_PATH)
+from src.dataset import open_store
+from src.inference import INFERENCE_BACKEND, load_classifier
 
-# Load training data
-PROCESSED_DATA_DIR = os.path.join(PROJECT_ROOT, "processed_data")
-words = sorted(os.listdir(PROCESSED_DATA_DIR))
-word_to_index = {word: i for i, word in enumerate(words)}
+# Load model with the configured backend (Keras .h5 or an exported TFLite model)
+print(f"Loading model ({INFERENCE_BACKEND} backend)...")
+model = load_classifier(INFERENCE_BACKEND)
 
-X_test = []
-y_test = []
+# Load training data from the memory-mapped dataset store (rebuilt if processed_data/ changed)
+PREDICT_BATCH_SIZE = 32
 
 print("Loading test data from training set...")
-for word in words:
-    word_path = os.path.join(PROCESSED_DATA_DIR, word)
-    for take_file in sorted(os.listdir(word_path)):
-        if take_file.endswith(".npy"):
-            filepath = os.path.join(word_path, take_file)
-            frames = np.load(filepath)
-            if frames.shape == (22, 80, 112):
-                frames = np.expand_dims(frames, axis=-1)
-                X_test.append(frames)
-                y_test.append(word_to_index[word])
+store = open_store()
+y_test, words = store.labels, store.words
 
-X_test = np.array(X_test)
-y_test = np.array(y_test)
-
-print(f"Loaded {len(X_test)} samples")
+print(f"Loaded {len(store)} samples")
 print(f"Testing model on training data...\n")
 
-# Make predictions
-predictions = model.predict(X_test, verbose=0)
+# Make predictions batch by batch so only one batch is normalised in memory at a time
+predictions = np.concatenate([model.predict(X_batch)
+                              for X_batch in store.batches(np.arange(len(store)), PREDICT_BATCH_SIZE)])
 predicted_classes = np.argmax(predictions, axis=1)
 confidences = np.max(predictions, axis=1)
 
@@ -57,7 +44,7 @@ for i, word in enumerate(words):
 
 # Show some example predictions
 print("\nExample predictions (first 10):")
-for i in range(min(10, len(X_test))):
+for i in range(min(10, len(store))):
     pred_word = words[predicted_classes[i]]
     actual_word = words[y_test[i]]
     conf = confidences[i] * 100
@@ -0,0 +1,78 @@
+"""
+Regression checks for incremental rebuilds of process_videos.py
+"""
+import os
+import sys
+import tempfile
+import numpy as np
+
+# Get the project root directory
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = SCRIPT_DIR
+sys.path.insert(0, PROJECT_ROOT)
+
+import src.process_videos as process_videos
+from src.preprocess import frame_number
+
+
+def lip_frames(count, seed):
+    """Random BGR lip crops of the size process_videos.py saves"""
+    width, height = process_videos.LIP_SIZE
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def build_take(lip_frames, take_dir):
+    """Write a take the way process_video does: PNG frames plus the fused sample"""
+    messages = []
+    process_videos.save_take(lip_frames, take_dir, messages)
+    process_videos.save_sample(lip_frames, process_videos.take_sample_path(take_dir), messages)
+
+
+def read_outputs(take_dir):
+    """Bytes of every PNG frame and of the sample of a take"""
+    outputs = {name: open(os.path.join(take_dir, name), "rb").read() for name in sorted(os.listdir(take_dir))}
+    outputs["sample"] = open(process_videos.take_sample_path(take_dir), "rb").read()
+    return outputs
+
+
+print("=" * 60)
+print("Testing incremental rebuilds of process_videos.py")
+print("=" * 60)
+
+failures = 0
+with tempfile.TemporaryDirectory() as tmp_dir:
+    process_videos.PROCESSED_DIR = os.path.join(tmp_dir, "processed_data")
+    process_videos.FUSED_PIPELINE = True
+    process_videos.SAVE_PNG_FRAMES = True
+    word_dir = os.path.join(tmp_dir, "data", "ok")
+
+    # Test 1: rebuilding a video must not change the takes of its duplicates
+    print("\n[1/2] Rebuilding the source of a duplicate take...")
+    source_dir, duplicate_dir = os.path.join(word_dir, "take_1"), os.path.join(word_dir, "take_2")
+    build_take(lip_frames(process_videos.FRAMES_PER_WORD, seed=1), source_dir)
+    process_videos.materialise_duplicate(source_dir, duplicate_dir)
+    before = read_outputs(duplicate_dir)
+    build_take(lip_frames(process_videos.FRAMES_PER_WORD, seed=2), source_dir)
+    if read_outputs(duplicate_dir) == before and read_outputs(source_dir) != before:
+        print("[OK] The duplicate kept its frames and sample")
+    else:
+        print("[ERROR] Rebuilding the source take changed its duplicate")
+        failures += 1
+
+    # Test 2: a rebuild that yields fewer frames must not leave the old ones behind
+    print("\n[2/2] Rebuilding a take with fewer frames...")
+    build_take(lip_frames(process_videos.FRAMES_PER_WORD - 5, seed=3), source_dir)
+    process_videos.materialise_duplicate(source_dir, duplicate_dir)
+    expected = [f"frame_{idx}.png" for idx in range(process_videos.FRAMES_PER_WORD - 5)]
+    if all(sorted(os.listdir(d), key=frame_number) == expected for d in (source_dir, duplicate_dir)):
+        print("[OK] Only the new frames are left in the take and its duplicate")
+    else:
+        print("[ERROR] Frames of the previous build were left in the take directory")
+        failures += 1
+
+print("\n" + "=" * 60)
+if failures:
+    print(f"[ERROR] {failures} check(s) failed")
+    sys.exit(1)
+print("[OK] All checks passed")